@@ -63,10 +63,14 @@ from oemof.tools import helpers
 import oemof.solph as solph
 import oemof.outputlib as outputlib
 
+import json
 import logging
 import os
+import glob
+import numpy as np
 import pandas as pd
 import pprint as pp
+from collections.abc import Mapping
 
 try:
     import matplotlib.pyplot as plt
@@ -74,6 +78,129 @@ except ImportError:
     plt = None
 
 
+def dump_results(results, dpath):
+    """Store the results dictionary as a directory of .npy files
+
+    The sequences of each result key are written into one .npy file and
+    the time indexes are stored once. The keys, the columns and the scalars
+    are written to 'manifest.json'. Only string labels are supported.
+
+    Parameters
+    ----------
+    results : dict
+        Results dictionary of `outputlib.processing.results`.
+    dpath : str
+        Directory of the dump. The files of an earlier dump in this
+        directory are removed, other files are kept.
+    """
+    os.makedirs(dpath, exist_ok=True)
+    for pattern in ('manifest.json', 'sequences_*.npy', 'index_*.npy'):
+        for old in glob.glob(os.path.join(dpath, pattern)):
+            os.remove(old)
+
+    indexes = []
+    manifest = []
+    for n, (key, value) in enumerate(results.items()):
+        sequences = value['sequences']
+        entry = {
+            'key': [None if k is None else k.label for k in key],
+            'scalars': {str(k): v.item() if hasattr(v, 'item') else v
+                        for k, v in value['scalars'].items()},
+            'columns': [str(c) for c in sequences.columns],
+            'file': None,
+            'index': None}
+        if not sequences.empty:
+            for pos, index in enumerate(indexes):
+                if index.equals(sequences.index):
+                    break
+            else:
+                pos = len(indexes)
+                indexes.append(sequences.index)
+                np.save(os.path.join(dpath, 'index_{0}.npy'.format(pos)),
+                        sequences.index.values)
+            entry['index'] = 'index_{0}.npy'.format(pos)
+            entry['file'] = 'sequences_{0}.npy'.format(n)
+            np.save(os.path.join(dpath, entry['file']),
+                    np.ascontiguousarray(sequences.values, dtype=float))
+        manifest.append(entry)
+
+    with open(os.path.join(dpath, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+
+class LazyResults(Mapping):
+    """Results dictionary restored from a directory of `dump_results`
+
+    Only the manifest is read on creation. The sequences of a key are
+    memory-mapped when the key is accessed for the first time, e.g. by
+    `results[(storage, None)]`. Functions that iterate over all items, such
+    as `outputlib.views.node`, load every key; pass them the subset of
+    `select` instead.
+
+    Parameters
+    ----------
+    dpath : str
+        Directory of the dump.
+    energysystem : oemof.solph.EnergySystem
+        The energy system the results belong to. Its nodes are used as keys.
+    """
+    def __init__(self, dpath, energysystem):
+        self.dpath = dpath
+        with open(os.path.join(dpath, 'manifest.json')) as f:
+            manifest = json.load(f)
+        self._entries = {
+            tuple(None if label is None else energysystem.groups[label]
+                  for label in entry['key']): entry
+            for entry in manifest}
+        self._indexes = {}
+        self._loaded = {}
+
+    def _index(self, filename):
+        if filename not in self._indexes:
+            self._indexes[filename] = pd.DatetimeIndex(
+                np.load(os.path.join(self.dpath, filename)))
+        return self._indexes[filename]
+
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            entry = self._entries[key]
+            if entry['file'] is None:
+                sequences = pd.DataFrame()
+            else:
+                sequences = pd.DataFrame(
+                    np.load(os.path.join(self.dpath, entry['file']),
+                            mmap_mode='r'),
+                    index=self._index(entry['index']),
+                    columns=entry['columns'], copy=False)
+            self._loaded[key] = {'scalars': pd.Series(entry['scalars'],
+                                                      dtype=float),
+                                 'sequences': sequences}
+        return self._loaded[key]
+
+    def select(self, label):
+        """Return the results of all keys that contain the node `label`
+
+        Only these keys are loaded.
+
+        Parameters
+        ----------
+        label : str
+            Label of the node.
+
+        Returns
+        -------
+        dict
+        """
+        return {key: self[key] for key, entry in self._entries.items()
+                if label in entry['key']}
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+
 solver = 'cbc'  # 'glpk', 'gurobi',....
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 24*7*8
@@ -178,8 +305,13 @@ logging.info('Store the energy system with the results.')
 # The processing module of the outputlib can be used to extract the results
 # from the model transfer them into a homogeneous structured dictionary.
 
-# add results to the energy system to make it possible to store them.
-energysystem.results['main'] = outputlib.processing.results(model)
+# The results are stored as arrays next to the dump of the energy system, so
+# that they can be restored lazily (see `LazyResults`).
+results_path = os.path.join(helpers.extend_basic_path('dumps'),
+                            'basic_example_results')
+dump_results(outputlib.processing.results(model), results_path)
+
+# add the meta results to the energy system to make it possible to store them.
 energysystem.results['meta'] = outputlib.processing.meta_results(model)
 
 # The default path is the '.oemof' folder in your $HOME directory.
@@ -188,7 +320,7 @@ energysystem.results['meta'] = outputlib.processing.meta_results(model)
 # You should use unique names/folders for valuable results to avoid
 # overwriting.
 
-# store energy system with results
+# store energy system with the meta results
 energysystem.dump(dpath=None, filename=None)
 
 # ****************************************************************************
@@ -200,8 +332,8 @@ logging.info('Restore the energy system and the results.')
 energysystem = solph.EnergySystem()
 energysystem.restore(dpath=None, filename=None)
 
-# define an alias for shorter calls below (optional)
-results = energysystem.results['main']
+# The sequences of a node are only loaded when the node is accessed.
+results = LazyResults(results_path, energysystem)
 storage = energysystem.groups['storage']
 
 # print a time slice of the state of charge
@@ -211,9 +343,10 @@ print(results[(storage, None)]['sequences']['2012-02-25 08:00:00':
                                             '2012-02-26 15:00:00'])
 print('')
 
-# get all variables of a specific component/bus
-custom_storage = outputlib.views.node(results, 'storage')
-electricity_bus = outputlib.views.node(results, 'electricity')
+# get all variables of a specific component/bus (only their keys are loaded)
+custom_storage = outputlib.views.node(results.select('storage'), 'storage')
+electricity_bus = outputlib.views.node(results.select('electricity'),
+                                       'electricity')
 
 # plot the time series (sequences) of a specific component/bus
 if plt is not None:
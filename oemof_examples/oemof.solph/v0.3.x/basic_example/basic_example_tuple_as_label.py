@@ -124,6 +124,36 @@ class Label(namedtuple('solph_label', ['tag1', 'tag2', 'tag3'])):
         return '_'.join(map(str, self._asdict().values()))
 
 
+class NodeResults(dict):
+    """Results dictionary with a prebuilt index of the keys of each node
+
+    The index is created once from the result keys. Afterwards `node()`
+    only passes the results of the requested node to `outputlib.views.node`
+    instead of scanning all keys of a large energy system. A node can be
+    addressed by the node object, by its label (e.g. a named tuple) or by
+    the string of its label.
+    """
+    def __init__(self, results):
+        super().__init__(results)
+        self.index = {}
+        for key in self:
+            for n in key:
+                if n is None:
+                    continue
+                for ref in {n, n.label, str(n.label)}:
+                    self.index.setdefault(ref, (n, []))[1].append(key)
+
+    def node(self, node, **kwargs):
+        """Same as `outputlib.views.node` using the index of the results"""
+        if node not in self.index:
+            return outputlib.views.node(dict(self), node, **kwargs)
+        obj, keys = self.index[node]
+        if not isinstance(node, str):
+            node = obj
+        return outputlib.views.node({k: self[k] for k in keys}, node,
+                                    **kwargs)
+
+
 solver = 'cbc'  # 'glpk', 'gurobi',....
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 24*7*8
@@ -235,7 +265,10 @@ logging.info('Store the energy system with the results.')
 # from the model transfer them into a homogeneous structured dictionary.
 
 # add results to the energy system to make it possible to store them.
-energysystem.results['main'] = outputlib.processing.results(model)
+# The NodeResults index makes the node views below independent of the size
+# of the energy system.
+energysystem.results['main'] = NodeResults(
+    outputlib.processing.results(model))
 energysystem.results['meta'] = outputlib.processing.meta_results(model)
 
 # The default path is the '.oemof' folder in your $HOME directory.
@@ -275,10 +308,13 @@ print(str(storage.label))
 print(type(storage))
 # get all variables of a specific component/bus
 # If you use the class the columns/index will be classes.
-custom_storage = outputlib.views.node(results, storage)
+custom_storage = results.node(storage)
 
 # If you use a string the columns/index will be strings.
-electricity_bus = outputlib.views.node(results, "bus_electricity_None")
+electricity_bus = results.node("bus_electricity_None")
+
+# The label itself (the named tuple) can be used as well.
+gas_bus = results.node(Label('bus', 'gas', None))
 
 # plot the time series (sequences) of a specific component/bus
 if plt is not None:
@@ -295,3 +331,6 @@ print('')
 # print the sums of the flows around the electricity bus
 print('********* Main results *********')
 print(electricity_bus['sequences'].sum(axis=0))
+
+# print the sums of the flows around the gas bus
+print(gas_bus['sequences'].sum(axis=0))
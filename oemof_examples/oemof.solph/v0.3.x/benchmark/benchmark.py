@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+A benchmark suite built from the energy systems of the examples in this
+folder. Each case can be scaled by the number of time steps and by the
+number of regions (the energy system of the example is replicated once per
+region with its own labels).
+
+The cases are:
+
+    * basic_example
+    * storage_investment_v1 ... storage_investment_v4
+    * simple_dispatch
+    * variable_chp
+    * generic_chp (combined cycle extraction turbine)
+    * lopf (electrical/lopf.py)
+
+For each run the time to create the nodes, to build the model, to solve it
+and to process the results as well as the peak memory are recorded. Every
+run is executed in a fresh process, so the peak memory belongs to this run
+only. The records are appended to a history file (JSON lines) together with
+the current git commit, so that runs can be compared across commits. The
+history file is stored in '.oemof/benchmark' in your $HOME directory (option
+`--history` to choose another file).
+
+The input data of the examples is repeated if more time steps are requested
+than the data file contains.
+
+Usage:
+
+    python benchmark.py --cases basic_example simple_dispatch \\
+        --timesteps 168 8760 --regions 1 4
+    python benchmark.py --compare <commit_1> <commit_2>
+
+Only the open solvers cbc and glpk are supported, the benchmark runs
+offline.
+
+Installation requirements
+-------------------------
+This example requires the version v0.3.x of oemof. Install by:
+
+    pip install 'oemof>=0.3,<0.4'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import argparse
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import oemof.solph as solph
+from oemof.outputlib import processing
+from oemof.tools import economics
+from oemof.tools import helpers
+from oemof.tools import logger
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss():
+    """Peak resident set size of the process in MiB (None if unknown)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # bytes on macOS, kilobytes on Linux
+        rss /= 1024
+    return rss / 1024
+
+
+def history_file():
+    """Default history file in the oemof directory of $HOME"""
+    return os.path.join(helpers.extend_basic_path('benchmark'),
+                        'benchmark_history.jsonl')
+
+
+def read_data(path, timesteps, sep=','):
+    """Read a data file of the examples and repeat it to `timesteps` rows"""
+    data = pd.read_csv(os.path.join(BASE_PATH, path), sep=sep)
+    rows = np.resize(np.arange(len(data)), timesteps)
+    return data.iloc[rows].reset_index(drop=True)
+
+
+def basic_example(es, timesteps, region):
+    data = read_data(os.path.join('basic_example', 'basic_example.csv'),
+                     timesteps)
+    bgas = solph.Bus(label='natural_gas' + region)
+    bel = solph.Bus(label='electricity' + region)
+    es.add(bgas, bel)
+    es.add(solph.Sink(label='excess_bel' + region,
+                      inputs={bel: solph.Flow()}))
+    es.add(solph.Source(label='rgas' + region, outputs={bgas: solph.Flow(
+        nominal_value=29825293 * timesteps / (24*7*8), summed_max=1)}))
+    es.add(solph.Source(label='wind' + region, outputs={bel: solph.Flow(
+        actual_value=data['wind'], nominal_value=1000000, fixed=True)}))
+    es.add(solph.Source(label='pv' + region, outputs={bel: solph.Flow(
+        actual_value=data['pv'], nominal_value=582000, fixed=True)}))
+    es.add(solph.Sink(label='demand' + region, inputs={bel: solph.Flow(
+        actual_value=data['demand_el'], fixed=True, nominal_value=1)}))
+    es.add(solph.Transformer(
+        label='pp_gas' + region,
+        inputs={bgas: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=10e10, variable_costs=50)},
+        conversion_factors={bel: 0.58}))
+    es.add(solph.components.GenericStorage(
+        nominal_storage_capacity=10077997,
+        label='storage' + region,
+        inputs={bel: solph.Flow(nominal_value=10077997/6)},
+        outputs={bel: solph.Flow(nominal_value=10077997/6,
+                                 variable_costs=0.001)},
+        loss_rate=0.00, initial_storage_level=None,
+        inflow_conversion_factor=1, outflow_conversion_factor=0.8))
+
+
+def storage_investment(es, timesteps, region, variant):
+    """Variant 1 to 4 of the storage_investment examples
+
+    The variants 1 and 4 optimise wind and pv, the variants 3 and 4 limit
+    the fossil share instead of using a gas price.
+    """
+    data = read_data(os.path.join('storage_investment',
+                                  'storage_investment.csv'), timesteps)
+    invest_re = variant in (1, 4)
+    fossil_share = variant in (3, 4)
+    epc = economics.annuity(capex=1000, n=20, wacc=0.05)
+
+    bgas = solph.Bus(label='natural_gas' + region)
+    bel = solph.Bus(label='electricity' + region)
+    es.add(bgas, bel)
+    es.add(solph.Sink(label='excess_bel' + region,
+                      inputs={bel: solph.Flow()}))
+    if fossil_share:
+        gas_flow = solph.Flow(
+            nominal_value=0.2 * data['demand_el'].sum() / 0.58,
+            summed_max=1)
+    else:
+        gas_flow = solph.Flow(variable_costs=0.04)
+    es.add(solph.Source(label='rgas' + region, outputs={bgas: gas_flow}))
+    for label, capacity in [('wind', 1000000), ('pv', 600000)]:
+        if invest_re:
+            size = {'investment': solph.Investment(ep_costs=epc)}
+        else:
+            size = {'nominal_value': capacity}
+        es.add(solph.Source(label=label + region, outputs={bel: solph.Flow(
+            actual_value=data[label], fixed=True, **size)}))
+    es.add(solph.Sink(label='demand' + region, inputs={bel: solph.Flow(
+        actual_value=data['demand_el'], fixed=True, nominal_value=1)}))
+    es.add(solph.Transformer(
+        label='pp_gas' + region,
+        inputs={bgas: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=10e10, variable_costs=0)},
+        conversion_factors={bel: 0.58}))
+    es.add(solph.components.GenericStorage(
+        label='storage' + region,
+        inputs={bel: solph.Flow(variable_costs=0.0001)},
+        outputs={bel: solph.Flow()},
+        loss_rate=0.00, initial_storage_level=0,
+        invest_relation_input_capacity=1/6,
+        invest_relation_output_capacity=1/6,
+        inflow_conversion_factor=1, outflow_conversion_factor=0.8,
+        investment=solph.Investment(ep_costs=epc)))
+
+
+def simple_dispatch(es, timesteps, region):
+    data = read_data(os.path.join('simple_dispatch', 'input_data.csv'),
+                     timesteps)
+    buses = {label: solph.Bus(label=label + region, balanced=False)
+             for label in ['coal', 'gas', 'oil', 'lignite']}
+    bel = solph.Bus(label='bel' + region)
+    bth = solph.Bus(label='bth' + region)
+    es.add(bel, bth, *buses.values())
+    es.add(solph.Sink(label='excess_el' + region, inputs={bel: solph.Flow()}))
+    es.add(solph.Source(label='wind' + region, outputs={bel: solph.Flow(
+        actual_value=data['wind'], nominal_value=66.3, fixed=True)}))
+    es.add(solph.Source(label='pv' + region, outputs={bel: solph.Flow(
+        actual_value=data['pv'], nominal_value=65.3, fixed=True)}))
+    es.add(solph.Sink(label='demand_el' + region, inputs={bel: solph.Flow(
+        nominal_value=85, actual_value=data['demand_el'], fixed=True)}))
+    es.add(solph.Sink(label='demand_th' + region, inputs={bth: solph.Flow(
+        nominal_value=40, actual_value=data['demand_th'], fixed=True)}))
+    for label, fuel, capacity, costs, efficiency in [
+            ('pp_coal', 'coal', 20.2, 25, 0.39),
+            ('pp_lig', 'lignite', 11.8, 19, 0.41),
+            ('pp_gas', 'gas', 41, 40, 0.50),
+            ('pp_oil', 'oil', 5, 50, 0.28)]:
+        es.add(solph.Transformer(
+            label=label + region,
+            inputs={buses[fuel]: solph.Flow()},
+            outputs={bel: solph.Flow(nominal_value=capacity,
+                                     variable_costs=costs)},
+            conversion_factors={bel: efficiency}))
+    es.add(solph.Transformer(
+        label='pp_chp' + region,
+        inputs={buses['gas']: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=30, variable_costs=42),
+                 bth: solph.Flow(nominal_value=40)},
+        conversion_factors={bel: 0.3, bth: 0.4}))
+    b_heat_source = solph.Bus(label='b_heat_source' + region)
+    es.add(b_heat_source)
+    es.add(solph.Source(label='heat_source' + region,
+                        outputs={b_heat_source: solph.Flow()}))
+    cop = 3
+    es.add(solph.Transformer(
+        label='heat_pump' + region,
+        inputs={bel: solph.Flow(), b_heat_source: solph.Flow()},
+        outputs={bth: solph.Flow(nominal_value=10)},
+        conversion_factors={bel: 1/3, b_heat_source: (cop-1)/cop}))
+
+
+def variable_chp(es, timesteps, region):
+    data = read_data(os.path.join('variable_chp', 'variable_chp.csv'),
+                     timesteps)
+    bgas = solph.Bus(label='natural_gas' + region)
+    es.add(bgas, solph.Source(label='rgas' + region, outputs={
+        bgas: solph.Flow(variable_costs=50)}))
+    for n, chp in [('', 'variable'), ('_2', 'fixed')]:
+        bel = solph.Bus(label='electricity' + n + region)
+        bth = solph.Bus(label='heat' + n + region)
+        es.add(bel, bth)
+        es.add(solph.Sink(label='excess_bel' + n + region,
+                          inputs={bel: solph.Flow()}))
+        es.add(solph.Sink(label='excess_bth' + n + region,
+                          inputs={bth: solph.Flow()}))
+        es.add(solph.Sink(label='demand_el' + n + region, inputs={
+            bel: solph.Flow(actual_value=data['demand_el'], fixed=True,
+                            nominal_value=1)}))
+        es.add(solph.Sink(label='demand_th' + n + region, inputs={
+            bth: solph.Flow(actual_value=data['demand_th'], fixed=True,
+                            nominal_value=741000)}))
+        if chp == 'variable':
+            # dummy transformer with a nominal input of zero
+            es.add(solph.Transformer(
+                label='fixed_chp_gas' + region,
+                inputs={bgas: solph.Flow(nominal_value=0)},
+                outputs={bel: solph.Flow(), bth: solph.Flow()},
+                conversion_factors={bel: 0.3, bth: 0.5}))
+            es.add(solph.components.ExtractionTurbineCHP(
+                label='variable_chp_gas' + region,
+                inputs={bgas: solph.Flow(nominal_value=10e10)},
+                outputs={bel: solph.Flow(), bth: solph.Flow()},
+                conversion_factors={bel: 0.3, bth: 0.5},
+                conversion_factor_full_condensation={bel: 0.5}))
+        else:
+            es.add(solph.Transformer(
+                label='fixed_chp_gas' + n + region,
+                inputs={bgas: solph.Flow(nominal_value=10e10)},
+                outputs={bel: solph.Flow(), bth: solph.Flow()},
+                conversion_factors={bel: 0.3, bth: 0.5}))
+
+
+def generic_chp(es, timesteps, region):
+    data = read_data(os.path.join('generic_chp', 'generic_chp.csv'),
+                     timesteps)
+    bgas = solph.Bus(label='bgas' + region)
+    bth = solph.Bus(label='bth' + region)
+    bel = solph.Bus(label='bel' + region)
+    es.add(bgas, bth, bel)
+    es.add(solph.Source(label='rgas' + region,
+                        outputs={bgas: solph.Flow()}))
+    es.add(solph.Source(label='source_th' + region,
+                        outputs={bth: solph.Flow(variable_costs=1000)}))
+    es.add(solph.Sink(label='demand_th' + region, inputs={bth: solph.Flow(
+        fixed=True, actual_value=data['demand_th'], nominal_value=200)}))
+    es.add(solph.Sink(label='demand_el' + region, inputs={bel: solph.Flow(
+        variable_costs=data['price_el'])}))
+    es.add(solph.components.GenericCHP(
+        label='combined_cycle_extraction_turbine' + region,
+        fuel_input={bgas: solph.Flow(
+            H_L_FG_share_max=[0.19] * timesteps)},
+        electrical_output={bel: solph.Flow(
+            nominal_value=200, min=80/200,
+            P_max_woDH=[200] * timesteps,
+            P_min_woDH=[80] * timesteps,
+            Eta_el_max_woDH=[0.53] * timesteps,
+            Eta_el_min_woDH=[0.43] * timesteps,
+            nonconvex=solph.NonConvex(startup_costs=5, shutdown_costs=5))},
+        heat_output={bth: solph.Flow(
+            Q_CW_min=[30] * timesteps)},
+        Beta=[0.19] * timesteps,
+        back_pressure=False))
+
+
+def lopf(es, timesteps, region):
+    buses = [solph.custom.ElectricalBus(label='b_{0}{1}'.format(n, region),
+                                        v_min=-1, v_max=1)
+             for n in range(3)]
+    es.add(*buses)
+    es.add(solph.custom.ElectricalLine(
+        input=buses[0], output=buses[1], reactance=0.0001,
+        investment=solph.Investment(ep_costs=10), min=-1, max=1))
+    es.add(solph.custom.ElectricalLine(
+        input=buses[1], output=buses[2], reactance=0.0001,
+        nominal_value=60, min=-1, max=1))
+    es.add(solph.custom.ElectricalLine(
+        input=buses[2], output=buses[0], reactance=0.0001,
+        nominal_value=60, min=-1, max=1))
+    es.add(solph.Source(label='gen_0' + region, outputs={
+        buses[0]: solph.Flow(nominal_value=100, variable_costs=50)}))
+    es.add(solph.Source(label='gen_1' + region, outputs={
+        buses[1]: solph.Flow(nominal_value=100, variable_costs=25)}))
+    es.add(solph.Sink(label='load' + region, inputs={
+        buses[2]: solph.Flow(nominal_value=100, actual_value=[1] * timesteps,
+                             fixed=True)}))
+
+
+CASES = {
+    'basic_example': basic_example,
+    'storage_investment_v1': lambda *a: storage_investment(*a, variant=1),
+    'storage_investment_v2': lambda *a: storage_investment(*a, variant=2),
+    'storage_investment_v3': lambda *a: storage_investment(*a, variant=3),
+    'storage_investment_v4': lambda *a: storage_investment(*a, variant=4),
+    'simple_dispatch': simple_dispatch,
+    'variable_chp': variable_chp,
+    'generic_chp': generic_chp,
+    'lopf': lopf,
+}
+
+
+def run_case(case, timesteps, regions, solver):
+    """Build, solve and process one case and return the measured values"""
+    record = {'case': case, 'timesteps': timesteps, 'regions': regions,
+              'solver': solver}
+
+    start = time.perf_counter()
+    es = solph.EnergySystem(timeindex=pd.date_range(
+        '1/1/2017', periods=timesteps, freq='H'))
+    for r in range(regions):
+        CASES[case](es, timesteps, '_r{0}'.format(r))
+    record['create_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    om = solph.Model(es)
+    record['build_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    om.solve(solver=solver)
+    record['solve_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processing.results(om)
+    record['results_time'] = time.perf_counter() - start
+
+    record['objective'] = processing.meta_results(om)['objective']
+    record['peak_rss_mb'] = peak_rss()
+    return record
+
+
+def git_commit():
+    """Return the current git commit of the repository (None if unknown)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_PATH,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases, timesteps, regions, solver='cbc', history=None):
+    """Run all combinations of cases, time steps and regions
+
+    Each run is executed in a fresh process. The records are appended to
+    the history file (default: `history_file()`) and returned as a
+    DataFrame.
+    """
+    if history is None:
+        history = history_file()
+    commit = git_commit()
+    context = multiprocessing.get_context('spawn')
+    records = []
+    for case in cases:
+        for steps in timesteps:
+            for n in regions:
+                logging.info('Run {0} with {1} time steps and {2} region(s)'
+                             .format(case, steps, n))
+                with ProcessPoolExecutor(max_workers=1,
+                                         mp_context=context) as pool:
+                    record = pool.submit(run_case, case, steps, n,
+                                         solver).result()
+                record['commit'] = commit
+                record['date'] = datetime.datetime.now().isoformat()
+                records.append(record)
+                with open(history, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+    return pd.DataFrame(records)
+
+
+def compare(commits, history=None):
+    """Compare the latest runs of two or more commits from the history"""
+    if history is None:
+        history = history_file()
+    with open(history) as f:
+        records = pd.DataFrame([json.loads(line) for line in f
+                                if line.strip()])
+    records = records[records['commit'].isin(commits)]
+    records = records.drop_duplicates(
+        ['commit', 'case', 'timesteps', 'regions', 'solver'], keep='last')
+    return records.pivot_table(
+        index=['case', 'timesteps', 'regions', 'solver'], columns='commit',
+        values=['build_time', 'solve_time', 'results_time', 'peak_rss_mb'])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the oemof.solph examples.')
+    parser.add_argument('--cases', nargs='+', default=sorted(CASES),
+                        choices=sorted(CASES))
+    parser.add_argument('--timesteps', nargs='+', type=int, default=[168])
+    parser.add_argument('--regions', nargs='+', type=int, default=[1])
+    parser.add_argument('--solver', default='cbc', choices=['cbc', 'glpk'])
+    parser.add_argument('--history')
+    parser.add_argument('--compare', nargs='+', metavar='COMMIT')
+    args = parser.parse_args()
+
+    logger.define_logging()
+    pd.set_option('display.width', 200)
+    if args.compare:
+        print(compare(args.compare, args.history))
+    else:
+        print(run(args.cases, args.timesteps, args.regions, args.solver,
+                  args.history))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,13 @@ General description
 -------------------
 Example that shows how to add an emission constraint in a model.
 
+The emissions of all flows and time steps are summed with pyomo's
+`quicksum` into one flat linear expression. This is the same constraint as
+`oemof.solph.constraints.emission_limit` without a nested sum expression,
+which keeps the memory and the recursion depth of pyomo low for large
+models. The same function can limit other integral values such as the fuel
+consumption (`keyword`).
+
 Installation requirements
 -------------------------
 This example requires the version v0.3.x of oemof. Install by:
@@ -17,8 +24,47 @@ __copyright__ = "oemof developer group"
 __license__ = "GPLv3"
 
 import pandas as pd
+import pyomo.environ as po
 import oemof.solph as solph
-from oemof.solph import constraints
+from oemof.solph.plumbing import sequence
+
+
+def emission_limit(model, limit, keyword='emission_factor', flows=None,
+                   name='emissions'):
+    """Limit the sum of all flows weighted with the attribute `keyword`
+
+    Adds the expression `total_<name>` and the constraint `<name>_limit`
+    to the model.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+    limit : float
+        Upper limit of the weighted sum.
+    keyword : str
+        Attribute of the flows with the weight (factor or sequence).
+    flows : dict
+        Flows (source, target) to include (default: all flows with the
+        attribute `keyword`).
+    name : str
+        Name of the limited value.
+    """
+    if flows is None:
+        flows = {k: flow for k, flow in model.flows.items()
+                 if hasattr(flow, keyword)}
+    terms = []
+    for (i, o), flow in flows.items():
+        factor = sequence(getattr(flow, keyword))
+        for t in model.TIMESTEPS:
+            coefficient = float(factor[t] * model.timeincrement[t])
+            if coefficient:
+                terms.append(coefficient * model.flow[i, o, t])
+    total = po.Expression(expr=po.quicksum(terms, linear=True))
+    model.add_component('total_' + name, total)
+    model.add_component(name + '_limit',
+                        po.Constraint(expr=(None, total, limit)))
+    return total
+
 
 # create energy system
 energysystem = solph.EnergySystem(
@@ -62,7 +108,7 @@ energysystem.add(solph.Transformer(
 model = solph.Model(energysystem)
 
 # add the emission constraint
-constraints.emission_limit(model, limit=100)
+emission_limit(model, limit=100)
 
 # print out the emission constraint
 model.total_emissions.pprint()
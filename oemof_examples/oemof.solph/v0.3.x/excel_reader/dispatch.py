@@ -25,6 +25,11 @@ Install by:
     pip3 install matplotlib
     pip3 install networkx
 
+To cache the parsed sheets between runs (see `nodes_from_excel`) install
+pyarrow:
+
+    pip3 install pyarrow
+
 If you want to plot the energy system's graph, you have to install pygraphviz
 using:
 
@@ -41,24 +46,224 @@ __copyright__ = "oemof developer group"
 __license__ = "GPLv3"
 
 import os
+import glob
+import shutil
+import hashlib
 import logging
+import tempfile
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
 from oemof.tools import logger
+from oemof.tools import helpers
 from oemof import solph
 from oemof import outputlib
 from oemof.graph import create_nx_graph
 from matplotlib import pyplot as plt
 import networkx as nx
 
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+# key in nodes data: name of the sheet in the Excel file
+SHEETS = {'buses': 'buses',
+          'commodity_sources': 'commodity_sources',
+          'transformers': 'transformers',
+          'renewables': 'renewables',
+          'demand': 'demand',
+          'storages': 'storages',
+          'powerlines': 'powerlines',
+          'timeseries': 'time_series'}
+
+
+def file_hash(filename, blocksize=2**20):
+    """Return the sha256 hex digest of the content of a file
+
+    Parameters
+    ----------
+    filename : :obj:`str`
+        Path to the file
+    blocksize : :obj:`int`
+        Number of bytes read at once
+
+    Returns
+    -------
+    :obj:`str`
+    """
+    sha = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(blocksize), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def read_cache(cache_path):
+    """Read nodes data from a cache directory written by `write_cache`
+
+    The time series are memory-mapped from a '.npy' file and wrapped in a
+    DataFrame without a copy, so a warm start neither parses the Excel file
+    nor reads the time series into memory before they are used. The small
+    sheets are read from uncompressed Feather files.
+
+    Parameters
+    ----------
+    cache_path : :obj:`str`
+        Cache directory of one version of the Excel file
+
+    Returns
+    -------
+    :obj:`dict`
+        Imported nodes data. The time series are read-only.
+    """
+    nodes_data = {}
+    for key in SHEETS:
+        if key == 'timeseries':
+            continue
+        nodes_data[key] = feather.read_feather(
+            os.path.join(cache_path, key + '.feather'), memory_map=True)
+    values = np.load(os.path.join(cache_path, 'timeseries.npy'),
+                     mmap_mode='r')
+    index = np.load(os.path.join(cache_path, 'timeseries_index.npy'))
+    columns = np.load(os.path.join(cache_path, 'timeseries_columns.npy'))
+    nodes_data['timeseries'] = pd.DataFrame(
+        values, index=pd.DatetimeIndex(index, name='timestamp'),
+        columns=columns, copy=False)
+    return nodes_data
+
+
+def write_cache(nodes_data, cache_path):
+    """Store nodes data in a cache directory
+
+    The time series are stored as a column-major '.npy' file of floats (with
+    the index and the column names in two more '.npy' files), so that
+    `read_cache` can memory-map them. The other sheets are stored as
+    uncompressed Feather files. The files are written to a temporary
+    directory first and moved to `cache_path` afterwards, so an interrupted
+    run never leaves a partial cache behind. A cache that cannot be written
+    is skipped with a warning.
+
+    Parameters
+    ----------
+    nodes_data : :obj:`dict`
+        Nodes data as returned by `nodes_from_excel`
+    cache_path : :obj:`str`
+        Cache directory of one version of the Excel file
+
+    Returns
+    -------
+    :obj:`bool`
+        True if the cache was written
+    """
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path))
+        for key, sheet in nodes_data.items():
+            if key == 'timeseries':
+                _write_timeseries(sheet, tmp_path)
+                continue
+            sheet = sheet.reset_index(drop=True)
+            sheet.columns = sheet.columns.astype(str)
+            feather.write_feather(sheet, os.path.join(tmp_path,
+                                                      key + '.feather'),
+                                  compression='uncompressed')
+        os.rename(tmp_path, cache_path)
+    except Exception as e:
+        if tmp_path is not None:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        logging.warning('Excel data could not be cached in {0}: {1}'
+                        .format(cache_path, e))
+        return False
+    return True
+
+
+def _write_timeseries(timeseries, path):
+    np.save(os.path.join(path, 'timeseries.npy'),
+            np.asfortranarray(timeseries.values, dtype=np.float64))
+    np.save(os.path.join(path, 'timeseries_index.npy'),
+            pd.DatetimeIndex(timeseries.index).values)
+    np.save(os.path.join(path, 'timeseries_columns.npy'),
+            np.array(timeseries.columns, dtype=str))
+
+
+def parse_sheet(filename, sheet):
+    """Parse one sheet of the Excel file
+
+    Module level function, so that it can be sent to worker processes.
+    """
+    return pd.read_excel(filename, sheet_name=sheet)
+
+
+def parse_excel(filename, processes=1):
+    """Parse all sheets of the Excel file
+
+    With more than one process the sheets are parsed concurrently in a
+    process pool, one sheet per worker. The time series sheet is not split
+    any further: the Excel readers of pandas decode every cell of a sheet
+    even if only some columns are requested (`usecols`), so each worker of
+    a column range would parse the whole sheet again.
+
+    Parameters
+    ----------
+    filename : :obj:`str`
+        Path to excel file
+    processes : :obj:`int`
+        Number of worker processes (default: 1, no process pool)
+
+    Returns
+    -------
+    :obj:`dict`
+        Imported nodes data
+    """
+    if processes > 1:
+        nodes_data = _parse_excel_parallel(filename, processes)
+    else:
+        xls = pd.ExcelFile(filename)
+        nodes_data = {key: xls.parse(sheet) for key, sheet in SHEETS.items()}
+        nodes_data['timeseries'].set_index('timestamp', inplace=True)
+
+    # set datetime index
+    nodes_data['timeseries'].index = pd.to_datetime(
+        nodes_data['timeseries'].index)
+
+    return nodes_data
+
 
-def nodes_from_excel(filename):
+def _parse_excel_parallel(filename, processes):
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        sheets = {key: pool.submit(parse_sheet, filename, sheet)
+                  for key, sheet in SHEETS.items()}
+        nodes_data = {key: future.result() for key, future in sheets.items()}
+    nodes_data['timeseries'].set_index('timestamp', inplace=True)
+    return nodes_data
+
+
+def nodes_from_excel(filename, cache=True, cache_dir=None, processes=1):
     """Read node data from Excel sheet
 
+    If `cache` is True and pyarrow is installed, the parsed sheets are stored
+    in a binary cache keyed on the absolute path and the content hash of the
+    Excel file. Later runs with an unchanged file read the cache instead of
+    parsing the file again. A changed file gets a new hash, so outdated caches
+    are never used and are removed when the new cache of the same path is
+    written. A cache that cannot be read is removed and the Excel file is
+    parsed again.
+
     Parameters
     ----------
     filename : :obj:`str`
         Path to excel file
+    cache : :obj:`bool`
+        Use the binary cache (default: True)
+    cache_dir : :obj:`str`
+        Directory of the cache. Defaults to '.oemof/excel_cache' in your
+        $HOME directory.
+    processes : :obj:`int`
+        Number of worker processes used to parse the Excel file (default: 1).
+        See `parse_excel`.
 
     Returns
     -------
@@ -71,29 +276,94 @@ def nodes_from_excel(filename):
         raise FileNotFoundError('Excel data file {} not found.'
                                 .format(filename))
 
-    xls = pd.ExcelFile(filename)
-
-    nodes_data = {'buses': xls.parse('buses'),
-                  'commodity_sources': xls.parse('commodity_sources'),
-                  'transformers': xls.parse('transformers'),
-                  'renewables': xls.parse('renewables'),
-                  'demand': xls.parse('demand'),
-                  'storages': xls.parse('storages'),
-                  'powerlines': xls.parse('powerlines'),
-                  'timeseries': xls.parse('time_series')
-                  }
-
-    # set datetime index
-    nodes_data['timeseries'].set_index('timestamp', inplace=True)
-    nodes_data['timeseries'].index = pd.to_datetime(
-        nodes_data['timeseries'].index)
-
+    if not cache or feather is None:
+        if cache:
+            logging.warning('Module pyarrow not found, Excel cache disabled.')
+        nodes_data = parse_excel(filename, processes=processes)
+        print('Data from Excel file {} imported.'
+              .format(filename))
+        return nodes_data
+
+    if cache_dir is None:
+        cache_dir = helpers.extend_basic_path('excel_cache')
+    # one directory per Excel file, so files with the same name in different
+    # directories do not share (and remove) their caches
+    path = os.path.abspath(filename)
+    name = os.path.splitext(os.path.basename(path))[0]
+    file_dir = os.path.join(cache_dir, '{0}_{1}'.format(
+        name, hashlib.sha256(path.encode()).hexdigest()[:16]))
+    cache_path = os.path.join(file_dir, file_hash(filename))
+
+    if os.path.isdir(cache_path):
+        try:
+            nodes_data = read_cache(cache_path)
+        except Exception as e:
+            # a damaged cache is removed and replaced by a new one
+            logging.warning('Excel cache {0} could not be read, parsing the '
+                            'Excel file again: {1}'.format(cache_path, e))
+            shutil.rmtree(cache_path, ignore_errors=True)
+        else:
+            print('Data from Excel file {} restored from cache {}.'
+                  .format(filename, cache_path))
+            return nodes_data
+
+    nodes_data = parse_excel(filename, processes=processes)
     print('Data from Excel file {} imported.'
           .format(filename))
 
+    # remove caches of older versions of the file
+    for outdated in glob.glob(os.path.join(file_dir, '[0-9a-f]' * 64)):
+        shutil.rmtree(outdated, ignore_errors=True)
+    if write_cache(nodes_data, cache_path):
+        logging.info('Excel data cached in {}.'.format(cache_path))
+
     return nodes_data
 
 
+def timeseries_by_label(timeseries):
+    """Group the 'label.attribute' columns of the timeseries sheet by label
+
+    The columns are split only once, so looking up the time series of a node
+    does not depend on the total number of time series columns.
+
+    Parameters
+    ----------
+    timeseries : :pandas:`pandas.DataFrame`
+        Time series sheet with columns named 'label.attribute'
+
+    Returns
+    -------
+    :obj:`dict`
+        Flow arguments (attribute: time series) for each label
+    """
+    ts_args = {}
+    for col in timeseries.columns.values:
+        label, _, attribute = col.partition('.')
+        if not attribute:
+            continue
+        ts_args.setdefault(label, {})[attribute] = timeseries[col]
+    return ts_args
+
+
+def active_rows(sheet):
+    """Return the active rows of a sheet as a list of dicts
+
+    The rows are filtered and converted column-wise instead of building a
+    pandas Series for every row with `iterrows()`.
+
+    Parameters
+    ----------
+    sheet : :pandas:`pandas.DataFrame`
+        Sheet with an 'active' column
+
+    Returns
+    -------
+    :obj:`list` of :obj:`dict`
+        One dict (column: value) per active row
+    """
+    return sheet[sheet['active'].astype(bool)].to_dict('records')
+
+
 def create_nodes(nd=None):
     """Create nodes (oemof objects) from node dict
 
@@ -112,129 +382,119 @@ def create_nodes(nd=None):
 
     nodes = []
 
+    # Group the time series columns by node label (one pass over all columns)
+    ts_args = timeseries_by_label(nd['timeseries'])
+
     # Create Bus objects from buses table
     busd = {}
 
-    for i, b in nd['buses'].iterrows():
-        if b['active']:
-            bus = solph.Bus(label=b['label'])
-            nodes.append(bus)
-
-            busd[b['label']] = bus
-            if b['excess']:
-                nodes.append(
-                    solph.Sink(label=b['label'] + '_excess',
-                               inputs={busd[b['label']]: solph.Flow(
-                                   variable_costs=b['excess costs'])})
+    for b in active_rows(nd['buses']):
+        bus = solph.Bus(label=b['label'])
+        nodes.append(bus)
+
+        busd[b['label']] = bus
+        if b['excess']:
+            nodes.append(
+                solph.Sink(label=b['label'] + '_excess',
+                           inputs={busd[b['label']]: solph.Flow(
+                               variable_costs=b['excess costs'])})
+            )
+        if b['shortage']:
+            nodes.append(
+                solph.Source(label=b['label'] + '_shortage',
+                             outputs={busd[b['label']]: solph.Flow(
+                                 variable_costs=b['shortage costs'])})
                 )
-            if b['shortage']:
-                nodes.append(
-                    solph.Source(label=b['label'] + '_shortage',
-                                 outputs={busd[b['label']]: solph.Flow(
-                                     variable_costs=b['shortage costs'])})
-                    )
 
     # Create Source objects from table 'commodity sources'
-    for i, cs in nd['commodity_sources'].iterrows():
-        if cs['active']:
-            nodes.append(
-                solph.Source(label=cs['label'],
-                             outputs={busd[cs['to']]: solph.Flow(
-                                 variable_costs=cs['variable costs'])})
-                        )
+    for cs in active_rows(nd['commodity_sources']):
+        nodes.append(
+            solph.Source(label=cs['label'],
+                         outputs={busd[cs['to']]: solph.Flow(
+                             variable_costs=cs['variable costs'])})
+                    )
 
     # Create Source objects with fixed time series from 'renewables' table
-    for i, re in nd['renewables'].iterrows():
-        if re['active']:
-            # set static outflow values
-            outflow_args = {'nominal_value': re['capacity'],
-                            'fixed': True}
-            # get time series for node and parameter
-            for col in nd['timeseries'].columns.values:
-                if col.split('.')[0] == re['label']:
-                    outflow_args[col.split('.')[1]] = nd['timeseries'][col]
-
-            # create
-            nodes.append(
-                solph.Source(label=re['label'],
-                             outputs={
-                                 busd[re['to']]: solph.Flow(**outflow_args)})
-            )
+    for re in active_rows(nd['renewables']):
+        # set static outflow values
+        outflow_args = {'nominal_value': re['capacity'],
+                        'fixed': True}
+        # get time series for node and parameter
+        outflow_args.update(ts_args.get(re['label'], {}))
+
+        # create
+        nodes.append(
+            solph.Source(label=re['label'],
+                         outputs={
+                             busd[re['to']]: solph.Flow(**outflow_args)})
+        )
 
     # Create Sink objects with fixed time series from 'demand' table
-    for i, de in nd['demand'].iterrows():
-        if de['active']:
-            # set static inflow values
-            inflow_args = {'nominal_value': de['nominal value'],
-                           'fixed': de['fixed']}
-            # get time series for node and parameter
-            for col in nd['timeseries'].columns.values:
-                if col.split('.')[0] == de['label']:
-                    inflow_args[col.split('.')[1]] = nd['timeseries'][col]
-
-            # create
-            nodes.append(
-                solph.Sink(label=de['label'],
-                           inputs={
-                               busd[de['from']]: solph.Flow(**inflow_args)})
-            )
+    for de in active_rows(nd['demand']):
+        # set static inflow values
+        inflow_args = {'nominal_value': de['nominal value'],
+                       'fixed': de['fixed']}
+        # get time series for node and parameter
+        inflow_args.update(ts_args.get(de['label'], {}))
+
+        # create
+        nodes.append(
+            solph.Sink(label=de['label'],
+                       inputs={
+                           busd[de['from']]: solph.Flow(**inflow_args)})
+        )
 
     # Create Transformer objects from 'transformers' table
-    for i, t in nd['transformers'].iterrows():
-        if t['active']:
-            # set static inflow values
-            inflow_args = {'variable_costs': t['variable input costs']}
-            # get time series for inflow of transformer
-            for col in nd['timeseries'].columns.values:
-                if col.split('.')[0] == t['label']:
-                    inflow_args[col.split('.')[1]] = nd['timeseries'][col]
-            # create
-            nodes.append(
-                solph.Transformer(
-                    label=t['label'],
-                    inputs={busd[t['from']]: solph.Flow(**inflow_args)},
-                    outputs={busd[t['to']]: solph.Flow(
-                            nominal_value=t['capacity'])},
-                    conversion_factors={busd[t['to']]: t['efficiency']})
-            )
-
-    for i, s in nd['storages'].iterrows():
-        if s['active']:
-            nodes.append(
-                solph.components.GenericStorage(
-                    label=s['label'],
-                    inputs={busd[s['bus']]: solph.Flow(
-                        nominal_value=s['capacity inflow'],
-                        variable_costs=s['variable input costs'])},
-                    outputs={busd[s['bus']]: solph.Flow(
-                        nominal_value=s['capacity outflow'],
-                        variable_costs=s['variable output costs'])},
-                    nominal_storage_capacity=s['nominal capacity'],
-                    loss_rate=s['capacity loss'],
-                    initial_storage_level=s['initial capacity'],
-                    max_storage_level=s['capacity max'],
-                    min_storage_level=s['capacity min'],
-                    inflow_conversion_factor=s['efficiency inflow'],
-                    outflow_conversion_factor=s['efficiency outflow'])
-            )
-
-    for i, p in nd['powerlines'].iterrows():
-        if p['active']:
-            bus1 = busd[p['bus_1']]
-            bus2 = busd[p['bus_2']]
-            nodes.append(
-                solph.custom.Link(
-                    label='powerline'
-                          + '_' + p['bus_1']
-                          + '_' + p['bus_2'],
-                    inputs={bus1: solph.Flow(),
-                            bus2: solph.Flow()},
-                    outputs={bus1: solph.Flow(nominal_value=p['capacity']),
-                             bus2: solph.Flow(nominal_value=p['capacity'])
-                             },
-                    conversion_factors={(bus1, bus2): p['efficiency'],
-                                        (bus2, bus1): p['efficiency']})
-            )
+    for t in active_rows(nd['transformers']):
+        # set static inflow values
+        inflow_args = {'variable_costs': t['variable input costs']}
+        # get time series for inflow of transformer
+        inflow_args.update(ts_args.get(t['label'], {}))
+        # create
+        nodes.append(
+            solph.Transformer(
+                label=t['label'],
+                inputs={busd[t['from']]: solph.Flow(**inflow_args)},
+                outputs={busd[t['to']]: solph.Flow(
+                        nominal_value=t['capacity'])},
+                conversion_factors={busd[t['to']]: t['efficiency']})
+        )
+
+    for s in active_rows(nd['storages']):
+        nodes.append(
+            solph.components.GenericStorage(
+                label=s['label'],
+                inputs={busd[s['bus']]: solph.Flow(
+                    nominal_value=s['capacity inflow'],
+                    variable_costs=s['variable input costs'])},
+                outputs={busd[s['bus']]: solph.Flow(
+                    nominal_value=s['capacity outflow'],
+                    variable_costs=s['variable output costs'])},
+                nominal_storage_capacity=s['nominal capacity'],
+                loss_rate=s['capacity loss'],
+                initial_storage_level=s['initial capacity'],
+                max_storage_level=s['capacity max'],
+                min_storage_level=s['capacity min'],
+                inflow_conversion_factor=s['efficiency inflow'],
+                outflow_conversion_factor=s['efficiency outflow'])
+        )
+
+    for p in active_rows(nd['powerlines']):
+        bus1 = busd[p['bus_1']]
+        bus2 = busd[p['bus_2']]
+        nodes.append(
+            solph.custom.Link(
+                label='powerline'
+                      + '_' + p['bus_1']
+                      + '_' + p['bus_2'],
+                inputs={bus1: solph.Flow(),
+                        bus2: solph.Flow()},
+                outputs={bus1: solph.Flow(nominal_value=p['capacity']),
+                         bus2: solph.Flow(nominal_value=p['capacity'])
+                         },
+                conversion_factors={(bus1, bus2): p['efficiency'],
+                                    (bus2, bus1): p['efficiency']})
+        )
 
     return nodes
 
@@ -305,66 +565,71 @@ def draw_graph(grph, edge_labels=True, node_color='#AFAFAF',
         plt.show()
 
 
-logger.define_logging()
-datetime_index = pd.date_range('2016-01-01 00:00:00',
-                               '2016-01-01 23:00:00',
-                               freq='60min')
+# The script part is only executed in the main process, the worker processes
+# of `parse_excel` import this module as well.
+if __name__ == '__main__':
+    logger.define_logging()
+    datetime_index = pd.date_range('2016-01-01 00:00:00',
+                                   '2016-01-01 23:00:00',
+                                   freq='60min')
 
-# model creation and solving
-logging.info('Starting optimization')
+    # model creation and solving
+    logging.info('Starting optimization')
 
-# initialisation of the energy system
-esys = solph.EnergySystem(timeindex=datetime_index)
+    # initialisation of the energy system
+    esys = solph.EnergySystem(timeindex=datetime_index)
 
-# read node data from Excel sheet
-excel_nodes = nodes_from_excel(
-    os.path.join(os.path.dirname(__file__), 'scenario.xlsx',))
+    # read node data from Excel sheet
+    excel_nodes = nodes_from_excel(
+        os.path.join(os.path.dirname(__file__), 'scenario.xlsx',))
 
-# create nodes from Excel sheet data
-my_nodes = create_nodes(nd=excel_nodes)
+    # create nodes from Excel sheet data
+    my_nodes = create_nodes(nd=excel_nodes)
 
-# add nodes and flows to energy system
-esys.add(*my_nodes)
+    # add nodes and flows to energy system
+    esys.add(*my_nodes)
 
-print("*********************************************************")
-print("The following objects have been created from excel sheet:")
-for n in esys.nodes:
-    oobj = str(type(n)).replace("<class 'oemof.solph.", "").replace("'>", "")
-    print(oobj + ':', n.label)
-print("*********************************************************")
+    print("*********************************************************")
+    print("The following objects have been created from excel sheet:")
+    for n in esys.nodes:
+        oobj = str(type(n)).replace("<class 'oemof.solph.", "").replace(
+            "'>", "")
+        print(oobj + ':', n.label)
+    print("*********************************************************")
 
-# creation of a least cost model from the energy system
-om = solph.Model(esys)
-om.receive_duals()
+    # creation of a least cost model from the energy system
+    om = solph.Model(esys)
+    om.receive_duals()
 
-# solving the linear problem using the given solver
-om.solve(solver='cbc')
+    # solving the linear problem using the given solver
+    om.solve(solver='cbc')
 
-# create graph of esys
-# You can use argument filename='/home/somebody/my_graph.graphml'
-# to dump your graph to disc. You can open it using e.g. yEd or gephi
-graph = create_nx_graph(esys)
+    # create graph of esys
+    # You can use argument filename='/home/somebody/my_graph.graphml'
+    # to dump your graph to disc. You can open it using e.g. yEd or gephi
+    graph = create_nx_graph(esys)
 
-# plot esys graph
-draw_graph(grph=graph, plot=True, layout='neato', node_size=1000,
-           node_color={
-               'R1_bus_el': '#cd3333',
-               'R2_bus_el': '#cd3333'
-           })
+    # plot esys graph
+    draw_graph(grph=graph, plot=True, layout='neato', node_size=1000,
+               node_color={
+                   'R1_bus_el': '#cd3333',
+                   'R2_bus_el': '#cd3333'
+               })
 
-# print and plot some results
-results = outputlib.processing.results(om)
+    # print and plot some results
+    results = outputlib.processing.results(om)
 
-region2 = outputlib.views.node(results, 'R2_bus_el')
-region1 = outputlib.views.node(results, 'R1_bus_el')
+    region2 = outputlib.views.node(results, 'R2_bus_el')
+    region1 = outputlib.views.node(results, 'R1_bus_el')
 
-print(region2['sequences'].sum())
-print(region1['sequences'].sum())
+    print(region2['sequences'].sum())
+    print(region1['sequences'].sum())
 
 
-fig, ax = plt.subplots(figsize=(10,5))
-region1['sequences'].plot(ax=ax)
-ax.legend(loc='upper center', prop={'size': 8}, bbox_to_anchor=(0.5, 1.4), ncol=3)
-fig.subplots_adjust(top=0.7)
-plt.show()
-logging.info("Done!")
+    fig, ax = plt.subplots(figsize=(10,5))
+    region1['sequences'].plot(ax=ax)
+    ax.legend(loc='upper center', prop={'size': 8},
+              bbox_to_anchor=(0.5, 1.4), ncol=3)
+    fig.subplots_adjust(top=0.7)
+    plt.show()
+    logging.info("Done!")
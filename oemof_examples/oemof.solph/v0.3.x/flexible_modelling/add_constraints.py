@@ -8,6 +8,16 @@ OperationalModel.
 The constraint we add forces a flow to be greater or equal a certain share
 of all inflows of its target bus. Moreover we will set an emission constraint.
 
+The flows of a node or with a certain attribute are looked up in a
+`FlowIndex` that is built once for the model. Searching all flows of the
+model within a constraint rule would be repeated for every node and time
+step.
+
+The share constraint is declared once for all flows and time steps
+(`add_flow_constraints`) from sparse terms (row, flow, coefficient). The
+coefficients are stored as arrays, so the constraint rule only builds a flat
+linear expression of the nonzero terms of each row and time step.
+
 Installation requirements
 -------------------------
 This example requires the latest version of oemof. Install by:
@@ -21,11 +31,143 @@ __copyright__ = "oemof developer group"
 __license__ = "GPLv3"
 
 import logging
+from types import MappingProxyType
+import numpy as np
 import pyomo.environ as po
 import pandas as pd
 
+try:
+    from pyomo.core.expr.numeric_expr import LinearExpression
+except ImportError:
+    LinearExpression = None
+
 from oemof.solph import (Sink, Transformer, Bus, Flow,
                          Model, EnergySystem)
+from oemof.solph.plumbing import sequence
+
+
+class FlowIndex:
+    """Read-only lookup of the flows of a model for custom constraints
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+
+    Attributes
+    ----------
+    inflows : mapping
+        Tuple of the flows (source, target) into each node.
+    outflows : mapping
+        Tuple of the flows (source, target) out of each node.
+    """
+    def __init__(self, model):
+        self.model = model
+        inflows = {}
+        outflows = {}
+        for i, o in model.flows:
+            outflows.setdefault(i, []).append((i, o))
+            inflows.setdefault(o, []).append((i, o))
+        self.inflows = MappingProxyType(
+            {n: tuple(flows) for n, flows in inflows.items()})
+        self.outflows = MappingProxyType(
+            {n: tuple(flows) for n, flows in outflows.items()})
+        self._attributes = {}
+
+    def by_attribute(self, name):
+        """Tuple of the flows that have the attribute `name` (not None)
+
+        The result is stored on the first call, so set the attribute on the
+        flows before.
+        """
+        if name not in self._attributes:
+            self._attributes[name] = tuple(
+                k for k, flow in self.model.flows.items()
+                if getattr(flow, name, None) is not None)
+        return self._attributes[name]
+
+
+def flow_index(model):
+    """FlowIndex of the model, built on the first call"""
+    if getattr(model, '_flow_index', None) is None:
+        model._flow_index = FlowIndex(model)
+    return model._flow_index
+
+
+def _per_timestep(value, timesteps):
+    """Float array of a number or a sequence for the time steps"""
+    if np.ndim(value) == 0:
+        return np.full(timesteps, float(value))
+    values = np.asarray(value, dtype=np.float64)[:timesteps]
+    if len(values) < timesteps:
+        raise ValueError('A sequence of {0} values is too short for {1} '
+                         'time steps.'.format(len(values), timesteps))
+    return values
+
+
+def add_flow_constraints(block, name, model, terms, sense, rhs=0):
+    """Add a family of linear flow constraints from sparse terms
+
+    For each row r and time step t the constraint is
+
+        sum of coefficient[t] * flow[i, o, t]  (sense)  rhs[r][t]
+
+    over all terms (r, (i, o), coefficient). The terms are grouped by row
+    and their coefficients are stored as one array per row. The rule of the
+    indexed constraint then only takes the nonzero coefficients of the time
+    step and builds a flat linear expression.
+
+    Parameters
+    ----------
+    block : pyomo.Block
+        Block the constraint is added to as `name`.
+    model : oemof.solph.Model
+    terms : iterable of tuple
+        Triples (row, (source, target), coefficient). The coefficient is a
+        number or a sequence with one value per time step. Terms of the same
+        row and flow are added up. The constraint is indexed by the row (a
+        tuple row is unpacked) and the time step.
+    sense : str
+        '<=', '>=' or '=='.
+    rhs : float, sequence or dict
+        Right hand side, a number or a sequence with one value per time
+        step. Pass a dict to set it for each row.
+    """
+    if sense not in ('<=', '>=', '=='):
+        raise ValueError("The sense has to be '<=', '>=' or '=='.")
+    timesteps = len(model.TIMESTEPS)
+    rows = {}
+    for row, flow, coefficient in terms:
+        coefficients = rows.setdefault(row, {})
+        coefficients[flow] = (coefficients.get(flow, 0) +
+                              _per_timestep(coefficient, timesteps))
+    matrices = {row: (list(coefficients), np.vstack(list(
+        coefficients.values()))) for row, coefficients in rows.items()}
+    bounds = {row: _per_timestep(rhs[row] if isinstance(rhs, dict) else rhs,
+                                 timesteps) for row in rows}
+    keys = {row if isinstance(row, tuple) else (row,): row for row in rows}
+
+    def rule(m, *index):
+        row, t = keys[index[:-1]], index[-1]
+        flows, matrix = matrices[row]
+        nonzero = np.flatnonzero(matrix[:, t])
+        if not len(nonzero):
+            return po.Constraint.Skip
+        coefficients = [float(c) for c in matrix[nonzero, t]]
+        variables = [model.flow[flows[k] + (t,)] for k in nonzero]
+        if LinearExpression is None:
+            expr = sum(c * v for c, v in zip(coefficients, variables))
+        else:
+            expr = LinearExpression(constant=0, linear_coefs=coefficients,
+                                    linear_vars=variables)
+        bound = float(bounds[row][t])
+        if sense == '<=':
+            return None, expr, bound
+        if sense == '>=':
+            return bound, expr, None
+        return expr, bound
+
+    index = [key + (t,) for key in keys for t in model.TIMESTEPS]
+    block.add_component(name, po.Constraint(index, rule=rule))
 
 
 def run_add_constraints_example(solver='cbc', nologg=False):
@@ -81,35 +223,36 @@ def run_add_constraints_example(solver='cbc', nologg=False):
     # Model instance and add the constraints.
     myblock = po.Block()
 
+    # the inflows, outflows and flows with an attribute are looked up in an
+    # index that is only built once for the model
+    index = flow_index(om)
+
     # create a pyomo set with the flows (i.e. list of tuples),
     # there will of course be only one flow inside this set, the one we used to
     # add outflow_share
-    myblock.MYFLOWS = po.Set(initialize=[k for (k, v) in om.flows.items()
-                                         if hasattr(v, 'outflow_share')])
+    myblock.MYFLOWS = po.Set(initialize=index.by_attribute('outflow_share'))
 
     # pyomo does not need a po.Set, we can use a simple list as well
-    myblock.COMMODITYFLOWS = [k for (k, v) in om.flows.items()
-                              if hasattr(v, 'emission_factor')]
+    myblock.COMMODITYFLOWS = index.by_attribute('emission_factor')
 
     # add the sub-model to the oemof Model instance
     om.add_component('MyBlock', myblock)
 
-    def _inflow_share_rule(m, s, e, t):
-        """pyomo rule definition: Here we can use all objects from the block or
-        the om object, in this case we don't need anything from the block
-        except the newly defined set MYFLOWS.
-        """
-        expr = (om.flow[s, e, t] >= om.flows[s, e].outflow_share[t] *
-                sum(om.flow[i, o, t] for (i, o) in om.FLOWS if o == e))
-        return expr
-
-    myblock.inflow_share = po.Constraint(myblock.MYFLOWS, om.TIMESTEPS,
-                                         rule=_inflow_share_rule)
-    # add emission constraint
+    # flow[s, e, t] >= outflow_share[t] * sum of the inflows of e, given as
+    # terms (row, flow, coefficient) with one row for each flow in MYFLOWS
+    terms = []
+    for s, e in myblock.MYFLOWS:
+        share = np.asarray(om.flows[s, e].outflow_share, dtype=np.float64)
+        terms.append(((s, e), (s, e), 1))
+        terms.extend(((s, e), flow, -share) for flow in index.inflows[e])
+    add_flow_constraints(myblock, 'inflow_share', om, terms, '>=')
+    # add emission constraint: quicksum creates one flat linear expression
+    # of all flows and time steps instead of a nested sum
     myblock.emission_constr = po.Constraint(expr=(
-            sum(om.flow[i, o, t]
-                for (i, o) in myblock.COMMODITYFLOWS
-                for t in om.TIMESTEPS) <= emission_limit))
+        None, po.quicksum(sequence(om.flows[i, o].emission_factor)[t] *
+                          om.timeincrement[t] * om.flow[i, o, t]
+                          for (i, o) in myblock.COMMODITYFLOWS
+                          for t in om.TIMESTEPS), emission_limit))
 
     # solve and write results to dictionary
     # you may print the model with om.pprint()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Records the wall time, the cpu time and the memory of the phases of a script
+(data load, node creation, model creation, solving, results processing).
+
+Each phase is written as one JSON line to the logger, so it ends up in the
+log file of `oemof.tools.logger.define_logging`. The records can also be
+stored as a JSON file to compare different runs.
+
+>>> phases = PhaseRecorder()
+>>> with phases('model creation', interval_length=48):
+...     om = MultiPeriodModel(es, interval_length=48, period=24)
+
+Two memory values are recorded:
+
+* 'max_rss_mb' is the highest resident set size of the process since its
+  start (module `resource`, Unix-like systems only). It never decreases, so
+  it belongs to the phase only if it is higher than in the phases before.
+* 'peak_traced_mb' is the peak of the memory allocated by Python within the
+  phase (module `tracemalloc`, Python 3.9 or newer). It is only recorded with
+  `PhaseRecorder(trace_memory=True)`, because tracing slows down the script,
+  and it does not include the memory of the solver.
+
+Inside a phase, `PhaseRecorder.pyomo_timing()` adds one record for the
+construction of each block of the pyomo model and one for each step of the
+solver call (writing the lp-file, running the solver, reading the results).
+The solver steps are only reported if `'report_timing': True` is passed in
+the `solve_kwargs`.
+
+>>> with phases('solve'), phases.pyomo_timing():
+...     om.solve(solver='cbc', solve_kwargs={'report_timing': True})
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import json
+import logging
+import re
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stdout
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# messages of pyomo's report_timing
+CONSTRUCTION = re.compile(r'^\s*([\d.]+) seconds to construct \S+ ([^;\s]+)')
+SOLVER_STEP = re.compile(r'^\s*([\d.]+) seconds required (?:for|to) (.+?)\s*$')
+
+
+def peak_rss():
+    """Highest resident set size of the process so far in MiB
+
+    None if unknown. The value never decreases during a run.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # bytes on macOS, kilobytes on Linux
+        rss /= 1024
+    return rss / 1024
+
+
+class _TimingHandler(logging.Handler):
+    """Sum up pyomo's construction times by top-level block"""
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.blocks = OrderedDict()
+
+    def emit(self, record):
+        match = CONSTRUCTION.match(record.getMessage())
+        if match is None:
+            return
+        block = re.split(r'[.\[]', match.group(2))[0]
+        # the message is rounded, the timer of pyomo is not
+        elapsed = getattr(record.msg, 'timer', float(match.group(1)))
+        seconds, components = self.blocks.get(block, (0, 0))
+        self.blocks[block] = (seconds + elapsed, components + 1)
+
+
+class _TimingStream:
+    """Pass stdout through and keep the solver steps of report_timing"""
+    def __init__(self, stream):
+        self.stream = stream
+        self.steps = []
+        self._line = ''
+
+    def write(self, text):
+        self._line += text
+        *lines, self._line = self._line.split('\n')
+        for line in lines:
+            match = SOLVER_STEP.match(line)
+            if match is not None:
+                self.steps.append((match.group(2), float(match.group(1))))
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class PhaseRecorder:
+    """Record time and memory of the phases of a script
+
+    Parameters
+    ----------
+    filename : str
+        Write all records to this JSON file after each phase (optional).
+    logger : logging.Logger
+        Logger for the records (default: root logger).
+    trace_memory : bool
+        Record the peak of the memory allocated by Python in each phase
+        (default: False). Phases must not be nested in this case.
+    """
+    def __init__(self, filename=None, logger=None, trace_memory=False):
+        self.filename = filename
+        self.logger = logger or logging.getLogger()
+        self.trace_memory = trace_memory
+        self.records = []
+        self._phases = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def __call__(self, name, **info):
+        """Measure the enclosed code as phase `name`
+
+        Additional keyword arguments are added to the record. The record is
+        yielded, so further values can be added inside the phase.
+        """
+        record = dict(phase=name, **info)
+        self._phases.append(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_time'] = time.perf_counter() - wall
+            record['cpu_time'] = time.process_time() - cpu
+            record['max_rss_mb'] = peak_rss()
+            if self.trace_memory:
+                record['peak_traced_mb'] = (
+                    tracemalloc.get_traced_memory()[1] / 2**20)
+            self._phases.pop()
+            self._add(record)
+
+    @contextmanager
+    def pyomo_timing(self):
+        """Record pyomo's timing of the enclosed code
+
+        Adds a record for the construction time of each top-level block
+        (phase 'construct <block>') and for each solver step reported by
+        `report_timing` (phase 'solver: <step>'). The records name the
+        enclosing phase as 'parent'. The timing messages are not passed on
+        to other handlers of the pyomo logger.
+        """
+        timing_logger = logging.getLogger('pyomo.common.timing.construction')
+        handler = _TimingHandler()
+        level, propagate = timing_logger.level, timing_logger.propagate
+        timing_logger.setLevel(logging.INFO)
+        timing_logger.propagate = False
+        timing_logger.addHandler(handler)
+        stream = _TimingStream(sys.stdout)
+        parent = self._phases[-1] if self._phases else None
+        try:
+            with redirect_stdout(stream):
+                yield
+        finally:
+            timing_logger.removeHandler(handler)
+            timing_logger.setLevel(level)
+            timing_logger.propagate = propagate
+            for block, (seconds, components) in handler.blocks.items():
+                self._add({'phase': 'construct ' + block, 'parent': parent,
+                           'wall_time': seconds, 'components': components})
+            for step, seconds in stream.steps:
+                self._add({'phase': 'solver: ' + step, 'parent': parent,
+                           'wall_time': seconds})
+
+    def _add(self, record):
+        self.records.append(record)
+        self.logger.info(json.dumps(record, default=str))
+        if self.filename is not None:
+            self.dump(self.filename)
+
+    def dump(self, filename):
+        """Write all records to a JSON file"""
+        with open(filename, 'w') as f:
+            json.dump(self.records, f, default=str, indent=2)
@@ -0,0 +1,1264 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+A rolling horizon for the standard `solph.Model`.
+
+The horizon of the energy system is solved in overlapping windows of
+`interval_length` time steps. Only the first `period` time steps of each
+window are committed, the next window starts at the end of the committed
+period. The storage levels at the end of the committed period are used as
+initial storage levels of the next window.
+
+Time series (e.g. `actual_value` or `variable_costs`) of the flows and nodes
+have to cover the whole horizon, they are cut to the window automatically.
+Longer time series are cut to the horizon. This includes time series in
+dictionaries (e.g. `conversion_factors`) and the costs of `NonConvex` flows.
+Constant parameters can be passed as usual. Storages need a
+`nominal_storage_capacity` and should not be `balanced` to be passed from one
+window to the next.
+
+In contrast to the `MultiPeriodModel` used in the other examples of this
+folder there are no `RollingHorizon` start-up states. Use `solph.NonConvex`
+for binary units. The status of the `NonConvex` flows at the end of the
+committed period is the `initial_status` of the next window, so start-ups
+are only counted where the status actually changes. solph keeps the initial
+status for the first `minimum_uptime`/`minimum_downtime` time steps of a
+window, which covers the remaining up or down time of the previous window.
+
+Warm start
+----------
+With `solve(..., warmstart=True)` the solution of the previous window is
+passed to the solver as a MIP start. The values of the overlapping time
+steps are taken from the previous solution, the remaining time steps get the
+value of the last time step of the previous window. This is supported by
+cbc, cplex and gurobi.
+
+Model update
+------------
+The model is built only once for the window length. For the following
+windows only the values that change are written into the model: the fixed
+flow values (`actual_value` of flows without `investment`), the flow bounds
+(`min`/`max` of flows without `nonconvex` or `investment`), the objective
+(`variable_costs`), the initial storage levels and the initial status. If
+other parameters are given as time series the model is rebuilt for every
+window. The shorter windows at the end of the horizon get their own model.
+
+Persistent solver
+-----------------
+With `solve(..., persistent=True)` the model is loaded once into a
+persistent solver instance (cplex or gurobi with their python interfaces).
+For the following windows only the changed bounds and the objective are sent
+to the solver. The solver folds fixed variables into the constraints, so the
+fixed flow values and the initial storage levels are set as equal lower and
+upper bounds instead, which only changes the variables. Only the few
+constraints with the initial status of the `NonConvex` flows are sent again.
+The solution is read back in memory, no lp-file or solution file is written.
+
+Results
+-------
+The results of the committed periods are written into arrays that are
+allocated once for the whole horizon (`ResultsSink`). With
+`solve(..., spill_dir='path')` these arrays are memory-mapped files, so the
+memory does not grow with the length of the horizon.
+
+Adaptive interval
+-----------------
+With `solve(..., adaptive=AdaptiveInterval(min_length, max_length,
+target_time))` the look-ahead of the next window is extended if the committed
+flows differ from the look-ahead of the previous window, and shortened if a
+window takes longer than `target_time` seconds or does not reach the MIP gap.
+Each change of the length builds a new model. The lengths are logged and
+stored in `windows`.
+
+Checkpoints
+-----------
+With `solve(..., checkpoint_dir='path')` the window, its interval length,
+the storage levels, the status of the `NonConvex` flows with the number of
+time steps in this status, the solved windows and the results are stored
+after each committed period.
+A run with the same `checkpoint_dir` continues after the last committed
+period, e.g. after a crash or a solver time-out. The first window after a
+restart is built from scratch (no warm start from the previous window).
+
+Parallel blocks
+---------------
+With `solve_parallel(blocks)` the horizon is split into blocks that are
+solved at the same time in worker processes, each block with estimated
+storage levels at its start and the `initial_status` of the `NonConvex`
+flows. A short reconciliation window around each border is solved
+afterwards. It starts with the storage levels and the status of the
+preceding block and ends with the status of the following block. A
+deviation from the storage levels of the following block is penalised in
+the objective, so the storage levels are continuous over the whole horizon
+as far as possible. This is only close to the sequential solution if the
+storages are small compared to the blocks.
+
+A window that is not solved to optimality (e.g. infeasible or aborted)
+raises a RuntimeError in all modes.
+
+Multi-resolution
+----------------
+With `solve_multi_resolution(factor, block_length)` the whole horizon is
+first solved with time series averaged over `factor` time steps. The storage
+levels and the status of this coarse solution at the borders of the blocks
+are then used as initial values and the levels, with costs for any
+deviation, as final levels of the blocks, so the blocks of `block_length`
+time steps can be solved at full resolution independently and in parallel.
+Optionally the on/off status of the `NonConvex` flows is fixed to the
+coarse solution as well.
+
+Installation requirements
+-------------------------
+This example requires the version v0.3.x of oemof. Install by:
+
+    pip install 'oemof>=0.3,<0.4'
+
+Optional to see the plots:
+
+    pip install matplotlib
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+import os
+import pickle
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+from pyomo.opt import TerminationCondition
+import oemof.solph as solph
+from oemof.network import Node
+from oemof.outputlib import processing, views
+
+try:
+    from matplotlib import pyplot as plt
+except ImportError:
+    plt = None
+
+# solvers that accept the values of the pyomo variables as MIP start
+WARMSTART_SOLVERS = ('cbc', 'cplex', 'gurobi')
+
+# solvers with a persistent pyomo interface ('<solver>_persistent')
+PERSISTENT_SOLVERS = ('cplex', 'gurobi')
+
+
+def _is_time_series(value, length):
+    """True for a time series that covers `length` steps (not a constant)"""
+    if (isinstance(value, (str, Mapping, set)) or hasattr(value, 'default') or
+            not hasattr(value, '__len__')):
+        return False
+    return len(value) >= length
+
+
+def _find_time_series(obj, length):
+    """Time series of an object as (container, key, values)
+
+    The container is the object itself or one of its dictionaries (e.g.
+    `conversion_factors`). The time series of a `NonConvex` attribute are
+    included, too.
+    """
+    for name, value in vars(obj).items():
+        if _is_time_series(value, length):
+            yield obj, name, np.asarray(value)
+        elif isinstance(value, Mapping):
+            for key, item in value.items():
+                if _is_time_series(item, length):
+                    yield value, key, np.asarray(item)
+        elif isinstance(value, solph.NonConvex):
+            yield from _find_time_series(value, length)
+
+
+def _status(values, steps, previous=None):
+    """Status of a nonconvex flow after the first `steps` of `values`
+
+    Returns the status and the number of time steps in this status.
+    `previous` is the return value for the time steps before `values`.
+    """
+    values = np.round(values[:steps])
+    status = int(values[-1])
+    changes = np.flatnonzero(values != status)
+    if changes.size:
+        return status, steps - changes[-1] - 1
+    if previous is not None and previous[0] == status:
+        return status, previous[1] + steps
+    return status, steps
+
+
+def _assign(container, key, value):
+    """Set an attribute or the item of a dictionary"""
+    if isinstance(container, Mapping):
+        container[key] = value
+    else:
+        setattr(container, key, value)
+
+
+def _shifted_index(index, shift, length):
+    """Index of the previous window that corresponds to `index`
+
+    The last element of an index is assumed to be the time step. Time steps
+    behind the previous window are mapped to its last time step.
+    """
+    if isinstance(index, tuple) and index and isinstance(index[-1], int):
+        return index[:-1] + (min(index[-1] + shift, length - 1),)
+    if isinstance(index, int):
+        return min(index + shift, length - 1)
+    return index
+
+
+def warm_start(model, previous, shift):
+    """Initialise the variables of `model` with a shifted previous solution
+
+    Parameters
+    ----------
+    model : solph.Model
+        Model of the new window.
+    previous : solph.Model
+        Solved model of the previous window.
+    shift : int
+        Number of time steps between the start of both windows.
+
+    `model` and `previous` can be the same model, the values are shifted in
+    place then.
+    """
+    length = len(previous.TIMESTEPS)
+    for var in model.component_objects(po.Var, descend_into=True):
+        prev = previous.find_component(var.name)
+        if prev is None:
+            continue
+        for index in var:
+            if var[index].fixed or _has_fixed_bounds(var[index]):
+                continue
+            prev_index = _shifted_index(index, shift, length)
+            if prev_index in prev and prev[prev_index].value is not None:
+                var[index].value = prev[prev_index].value
+
+
+def _has_fixed_bounds(var):
+    """True for a variable with equal lower and upper bounds"""
+    return var.has_lb() and var.has_ub() and var.lb == var.ub
+
+
+def _fix(var, value, by_bounds=False):
+    """Fix a variable, with `by_bounds` by equal lower and upper bounds
+
+    A persistent solver folds fixed variables into the constraints, a
+    variable that is fixed by its bounds stays a variable in the solver.
+    """
+    if not by_bounds:
+        var.fix(value)
+        return
+    var.unfix()
+    var.setlb(value)
+    var.setub(value)
+    var.value = value
+
+
+def _update_persistent(opt, variables, constraints):
+    """Send the changed variables and constraints to a persistent solver
+
+    The bounds of the variables are updated in place, the constraints are
+    removed and added again.
+    """
+    for var in variables:
+        opt.update_var(var)
+    for con in constraints:
+        opt.remove_constraint(con)
+        opt.add_constraint(con)
+
+
+def _add_end_level_costs(model, end_levels, costs):
+    """Penalise the deviation of the last storage levels from `end_levels`
+
+    The deviations above and below the levels are added to the objective
+    with the given costs per unit.
+    """
+    block = po.Block()
+    model.add_component('EndLevelCosts', block)
+    block.STORAGES = po.Set(initialize=list(end_levels), ordered=True)
+    block.above = po.Var(block.STORAGES, within=po.NonNegativeReals)
+    block.below = po.Var(block.STORAGES, within=po.NonNegativeReals)
+    last = model.TIMESTEPS[-1]
+
+    def deviation_rule(block, s):
+        return (model.GenericStorageBlock.capacity[s, last] - end_levels[s] ==
+                block.above[s] - block.below[s])
+    block.deviation = po.Constraint(block.STORAGES, rule=deviation_rule)
+    model.objective.expr = model.objective.expr + costs * sum(
+        block.above[s] + block.below[s] for s in block.STORAGES)
+
+
+def _check_solved(solver_results, name):
+    """Raise an error if the solver did not find an optimal solution"""
+    condition = solver_results.solver.termination_condition
+    if condition != TerminationCondition.optimal:
+        raise RuntimeError('{0} ended with the termination condition {1}.'
+                           .format(name, condition))
+
+
+def _mip_gap(solver_results):
+    """Relative gap between the bounds of the objective (0 if unknown)"""
+    try:
+        lower = float(solver_results.problem.lower_bound)
+        upper = float(solver_results.problem.upper_bound)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+    if not (np.isfinite(lower) and np.isfinite(upper)):
+        return 0.0
+    return abs(upper - lower) / max(abs(upper), 1e-10)
+
+
+def _flow_values(results):
+    """Values of all flows of a window by result key"""
+    return {key: value['sequences']['flow'].values
+            for key, value in results.items()
+            if 'flow' in value['sequences']}
+
+
+def _decision_change(flows, previous, shift):
+    """Relative change of the flows against the look-ahead
+
+    `previous` are the flows of the window `shift` time steps before. The
+    time steps that both windows cover are compared. If the windows do not
+    overlap (the previous window had no look-ahead) the change is infinite.
+    """
+    change = total = 0.0
+    compared = 0
+    for key, values in flows.items():
+        old = previous.get(key)
+        if old is None:
+            continue
+        old = old[shift:shift + len(values)]
+        compared += len(old)
+        change += np.abs(values[:len(old)] - old).sum()
+        total += np.abs(old).sum()
+    if not compared:
+        return np.inf
+    return change / max(total, 1e-10)
+
+
+class AdaptiveInterval:
+    """Adapt the interval length of the windows while solving
+
+    The interval is extended by `step` time steps if the flows of a window
+    differ by more than `tolerance` from the look-ahead of the previous
+    window, i.e. the look-ahead was too short. A window without look-ahead
+    (the interval equals the period) always extends the interval. Otherwise
+    it is shortened by `step` time steps if the window took longer than
+    `target_time` or the relative MIP gap is above `max_gap`.
+
+    Parameters
+    ----------
+    min_length : int
+        Shortest interval, at least the period.
+    max_length : int
+        Longest interval.
+    target_time : float
+        Solve time per window in seconds.
+    max_gap : float
+        Relative MIP gap that is accepted.
+    tolerance : float
+        Accepted relative change of the committed flows.
+    step : int
+        Change of the interval length (default: a quarter of the range).
+    """
+    def __init__(self, min_length, max_length, target_time, max_gap=1e-4,
+                 tolerance=0.05, step=None):
+        if not 0 < min_length <= max_length:
+            raise ValueError('min_length has to be between 1 and max_length.')
+        self.min_length = min_length
+        self.max_length = max_length
+        self.target_time = target_time
+        self.max_gap = max_gap
+        self.tolerance = tolerance
+        self.step = step or max(1, (max_length - min_length) // 4)
+
+    def clip(self, length):
+        return min(max(length, self.min_length), self.max_length)
+
+    def __call__(self, length, solve_time, gap, change):
+        """Interval length of the next window"""
+        if change > self.tolerance:
+            length += self.step
+        elif solve_time > self.target_time or gap > self.max_gap:
+            length -= self.step
+        return self.clip(length)
+
+
+def _labels(key):
+    """Result key with the labels instead of the nodes"""
+    return tuple(None if n is None else n.label for n in key)
+
+
+class ResultsSink:
+    """Results of the committed periods, preallocated for the horizon
+
+    The sequences of each result key are written into one array of the
+    length of the horizon, so nothing is concatenated while the windows are
+    solved.
+
+    Parameters
+    ----------
+    timeindex : pandas.DatetimeIndex
+        Time index of the horizon.
+    spill_dir : str
+        Keep the arrays as memory-mapped npy-files in this directory instead
+        of in memory (optional). Written time steps can be paged out to the
+        disk, so the memory stays flat for long horizons.
+    """
+    def __init__(self, timeindex, spill_dir=None):
+        self.timeindex = timeindex
+        self.spill_dir = spill_dir
+        self._scalars = {}
+        self._columns = {}
+        self._arrays = {}
+        self._files = {}
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _allocate(self, key, columns):
+        shape = (len(self.timeindex), len(columns))
+        if self.spill_dir is None:
+            array = np.full(shape, np.nan)
+        else:
+            self._files[key] = 'sequences_{0}.npy'.format(len(self._arrays))
+            array = np.lib.format.open_memmap(
+                os.path.join(self.spill_dir, self._files[key]), mode='w+',
+                dtype=np.float64, shape=shape)
+            array[:] = np.nan
+        self._columns[key] = columns
+        self._arrays[key] = array
+        return array
+
+    def write(self, results, position, steps):
+        """Write the first `steps` time steps of `results` at `position`"""
+        for key, value in results.items():
+            sequences = value['sequences']
+            array = self._arrays.get(key)
+            if array is None:
+                array = self._allocate(key, sequences.columns)
+            array[position:position + steps] = sequences.values[:steps]
+            self._scalars[key] = value['scalars']
+
+    def flush(self):
+        """Write the memory-mapped arrays to the disk"""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def state(self):
+        """Keys, files, columns and scalars of the memory-mapped arrays
+
+        The nodes of the keys are replaced by their labels, so the state can
+        be pickled independently of the energy system.
+        """
+        self.flush()
+        return [(_labels(key), self._files[key], list(self._columns[key]),
+                 self._scalars[key]) for key in self._arrays]
+
+    def restore(self, state, nodes):
+        """Open the arrays of a `state` again
+
+        Parameters
+        ----------
+        state : list
+            Return value of `state`.
+        nodes : dict
+            Nodes of the energy system by label.
+        """
+        for labels, filename, columns, scalars in state:
+            key = tuple(None if label is None else nodes[label]
+                        for label in labels)
+            self._files[key] = filename
+            self._columns[key] = pd.Index(columns)
+            self._scalars[key] = scalars
+            self._arrays[key] = np.load(
+                os.path.join(self.spill_dir, filename), mmap_mode='r+')
+
+    def results(self):
+        """Results in the format of `outputlib.processing.results`
+
+        The sequences are views on the preallocated arrays.
+        """
+        self.flush()
+        return {key: {'scalars': self._scalars[key],
+                      'sequences': pd.DataFrame(
+                          array, index=self.timeindex,
+                          columns=self._columns[key], copy=False)}
+                for key, array in self._arrays.items()}
+
+
+class RollingDispatch:
+    """Solve an energy system in overlapping windows
+
+    Parameters
+    ----------
+    energysystem : solph.EnergySystem
+        Energy system with time series for the whole horizon.
+    interval_length : int
+        Number of time steps of each window.
+    period : int
+        Number of time steps committed from each window.
+
+    Attributes
+    ----------
+    multiperiod_results : dict
+        Results of the committed periods in the format of
+        `outputlib.processing.results` (after `solve`).
+    windows : list of dict
+        Start, end and objective of each solved window.
+    storage_levels : dict
+        Storage level of each storage at the end of the last committed
+        period.
+    nonconvex_status : dict
+        Status of each nonconvex flow at the end of the last committed period
+        and the number of time steps in this status, by flow (output, input).
+    coarse_results : dict
+        Results of the coarse model (after `solve_multi_resolution`).
+    """
+    def __init__(self, energysystem, interval_length, period):
+        if not 0 < period <= interval_length:
+            raise ValueError('The period must be between 1 and the '
+                             'interval_length ({0}).'.format(interval_length))
+        self.es = energysystem
+        self.interval_length = interval_length
+        self.period = period
+        self.timeindex = energysystem.timeindex
+        self.storages = [
+            n for n in energysystem.nodes
+            if isinstance(n, solph.components.GenericStorage)]
+        self.storage_levels = {}
+        self._initial_storage_levels = {
+            s: s.initial_storage_level for s in self.storages}
+        self.nonconvex_status = {}
+        self._nonconvex = {key: flow for key, flow
+                           in energysystem.flows().items()
+                           if flow.nonconvex is not None}
+        self._initial_status = {key: flow.nonconvex.initial_status
+                                for key, flow in self._nonconvex.items()}
+        self.multiperiod_results = None
+        self.coarse_results = None
+        self.windows = []
+
+        horizon = len(self.timeindex)
+        self._time_series = [
+            series for obj in (list(energysystem.nodes) +
+                               list(energysystem.flows().values()))
+            for series in _find_time_series(obj, horizon)]
+        self._flow_series = {}
+        for obj, name, _ in self._time_series:
+            if isinstance(obj, solph.Flow):
+                self._flow_series.setdefault(obj, set()).add(name)
+
+    def _set_window(self, start, stop):
+        """Cut the time index and all time series to the window"""
+        self.es.timeindex = self.timeindex[start:stop]
+        for obj, name, values in self._time_series:
+            _assign(obj, name, values[start:stop])
+
+    def _reset(self):
+        """Restore the time index, time series and initial storage levels"""
+        self.es.timeindex = self.timeindex
+        for obj, name, values in self._time_series:
+            _assign(obj, name, values)
+        for s, level in self._initial_storage_levels.items():
+            s.initial_storage_level = level
+        for key, status in self._initial_status.items():
+            self._nonconvex[key].nonconvex.initial_status = status
+
+    def _updatable(self):
+        """True if all time series can be updated in a built model"""
+        for obj, name, values in self._time_series:
+            if not isinstance(obj, solph.Flow):
+                return False
+            if name in ('min', 'max'):
+                if (obj.nonconvex is not None or obj.investment is not None or
+                        obj.nominal_value is None):
+                    return False
+            elif name == 'actual_value':
+                # the profile of an investment flow is part of a constraint
+                if obj.investment is not None:
+                    return False
+            elif name != 'variable_costs':
+                return False
+        return True
+
+    def _fixed_variables(self, om):
+        """Fixed variables that are changed by `_update_model`"""
+        for (o, i), flow in om.flows.items():
+            if (flow.fixed and flow.nominal_value is not None and
+                    'actual_value' in self._flow_series.get(flow, ())):
+                for t in om.TIMESTEPS:
+                    yield om.flow[o, i, t]
+        for s in self.storages:
+            yield om.GenericStorageBlock.init_cap[s]
+
+    def _update_model(self, om, persistent=False):
+        """Write the values of the current window into a built model
+
+        With `persistent` the values are fixed by the bounds of the
+        variables (see `_fix`). Returns the changed variables and whether the
+        objective was rebuilt.
+        """
+        changed = []
+        for (o, i), flow in om.flows.items():
+            names = self._flow_series.get(flow, ())
+            if flow.nominal_value is None:
+                continue
+            for t in om.TIMESTEPS:
+                if flow.fixed and 'actual_value' in names:
+                    _fix(om.flow[o, i, t],
+                         flow.actual_value[t] * flow.nominal_value, persistent)
+                elif 'min' in names or 'max' in names:
+                    om.flow[o, i, t].setlb(flow.min[t] * flow.nominal_value)
+                    om.flow[o, i, t].setub(flow.max[t] * flow.nominal_value)
+                else:
+                    continue
+                changed.append(om.flow[o, i, t])
+        for s in self.storages:
+            if s in self.storage_levels:
+                _fix(om.GenericStorageBlock.init_cap[s],
+                     self.storage_levels[s], persistent)
+                changed.append(om.GenericStorageBlock.init_cap[s])
+        objective = any('variable_costs' in names
+                        for names in self._flow_series.values())
+        if objective:
+            om._add_objective(update=True)
+        return changed, objective
+
+    def _update_initial_status(self, om):
+        """Write the initial status of the nonconvex flows into a built model
+
+        The initial status is a constant in the first start-up and shut-down
+        constraints and in the minimum up and down time constraints at the
+        borders of the window. These constraints are set again as in
+        `solph.blocks.NonConvexFlow`. Returns the changed constraints.
+        """
+        changed = []
+        if not self.nonconvex_status:
+            return changed
+        block = om.NonConvexFlow
+        first, last = om.TIMESTEPS.first(), om.TIMESTEPS.last()
+        for (o, i), (status, _) in self.nonconvex_status.items():
+            if (o, i) in block.STARTUPFLOWS:
+                con = block.startup_constr[o, i, first]
+                con.set_value(block.startup[o, i, first] >=
+                              block.status[o, i, first] - status)
+                changed.append(con)
+            if (o, i) in block.SHUTDOWNFLOWS:
+                con = block.shutdown_constr[o, i, first]
+                con.set_value(block.shutdown[o, i, first] >=
+                              status - block.status[o, i, first])
+                changed.append(con)
+            for flows, constraint in (
+                    (block.MINUPTIMEFLOWS, block.min_uptime_constr),
+                    (block.MINDOWNTIMEFLOWS, block.min_downtime_constr)):
+                if (o, i) not in flows:
+                    continue
+                border = om.flows[o, i].nonconvex.max_up_down
+                for t in om.TIMESTEPS:
+                    if not border <= t <= last - border:
+                        constraint[o, i, t].set_value(
+                            block.status[o, i, t] == status)
+                        changed.append(constraint[o, i, t])
+        return changed
+
+    def _set_initial_state(self):
+        """Committed storage levels and status as initial values"""
+        for s in self.storages:
+            if s in self.storage_levels:
+                s.initial_storage_level = (self.storage_levels[s] /
+                                           s.nominal_storage_capacity)
+        for key, (status, _) in self.nonconvex_status.items():
+            self._nonconvex[key].nonconvex.initial_status = status
+
+    def _commit(self, results, position, steps, sink):
+        """Keep the first `steps` time steps of the window results"""
+        sink.write(results, position, steps)
+        for s in self.storages:
+            capacity = results[(s, None)]['sequences']['capacity']
+            self.storage_levels[s] = capacity.iloc[steps - 1]
+        for key in self._nonconvex:
+            self.nonconvex_status[key] = _status(
+                results[key]['sequences']['status'].values, steps,
+                self.nonconvex_status.get(key))
+
+    def _options(self, solver, solve_kwargs, warmstart, persistent, rebuild):
+        """Check the solve options against the solver and the model"""
+        solve_kwargs = dict(solve_kwargs or {})
+        if warmstart:
+            if solver in WARMSTART_SOLVERS:
+                solve_kwargs['warmstart'] = True
+            else:
+                logging.warning('Solver {0} does not support a warm start.'
+                                .format(solver))
+                warmstart = False
+        if persistent and solver not in PERSISTENT_SOLVERS:
+            logging.warning('Solver {0} has no persistent interface.'
+                            .format(solver))
+            persistent = False
+
+        if rebuild is None:
+            rebuild = not self._updatable()
+        if rebuild:
+            logging.info('The model is rebuilt for every window.')
+        return solve_kwargs, warmstart, persistent, rebuild
+
+    def _solve_range(self, first, last, sink, solver, solve_kwargs,
+                     warmstart, rebuild, persistent, end_levels=None,
+                     origin=None, checkpoint=None, adaptive=None,
+                     status=None, length=None, end_costs=None,
+                     end_status=None, **kwargs):
+        """Solve the windows that commit the time steps `first` to `last`
+
+        The results are written into `sink`, the time step `origin` (default:
+        `first`) at position 0. The windows may look ahead behind `last`.
+        The deviations of the storage levels at the end of the last window
+        from `end_levels` are added to the objective with `end_costs`, the
+        status of nonconvex flows at its end is fixed to `end_status`.
+        `checkpoint` is called with the start and the interval length of the
+        next window after each committed period. `adaptive` changes the
+        interval length from window to window (see `AdaptiveInterval`),
+        starting with `length` (default: `interval_length`). `status` fixes
+        the status of nonconvex flows to the given values of the horizon.
+        """
+        if persistent and kwargs:
+            raise ValueError('The keyword arguments {0} of solph.Model.solve '
+                             'are not supported with a persistent solver.'
+                             .format(sorted(kwargs)))
+        horizon = len(self.timeindex)
+        if origin is None:
+            origin = first
+        if length is None:
+            length = self.interval_length
+        if adaptive is not None:
+            if adaptive.min_length < self.period:
+                raise ValueError('The min_length must not be shorter than '
+                                 'the period ({0}).'.format(self.period))
+            length = adaptive.clip(length)
+        previous = None
+        flows = None
+        opt = None
+        try:
+            for start in range(first, last, self.period):
+                stop = min(start + length, horizon)
+                self._set_window(start, stop)
+                changed, renew, objective = [], [], False
+                if (rebuild or previous is None or
+                        len(previous.TIMESTEPS) != stop - start):
+                    self._set_initial_state()
+                    om = solph.Model(self.es)
+                    if persistent:
+                        for var in self._fixed_variables(om):
+                            if var.fixed:
+                                _fix(var, var.value, by_bounds=True)
+                        opt = po.SolverFactory(solver + '_persistent')
+                        opt.set_instance(om)
+                else:
+                    om = previous
+                    changed, objective = self._update_model(om, persistent)
+                    renew = self._update_initial_status(om)
+                if end_levels and start + self.period >= last:
+                    _add_end_level_costs(om, end_levels, end_costs)
+                if end_status and start + self.period >= last:
+                    for (o, i), value in end_status.items():
+                        var = om.NonConvexFlow.status[
+                            o, i, om.TIMESTEPS.last()]
+                        var.fix(value)
+                        changed.append(var)
+                for (o, i), values in (status or {}).items():
+                    for t in om.TIMESTEPS:
+                        var = om.NonConvexFlow.status[o, i, t]
+                        var.fix(values[start + t])
+                        changed.append(var)
+                if persistent:
+                    _update_persistent(opt, changed, renew)
+                    if objective:
+                        opt.set_objective(om.objective)
+                if warmstart and previous is not None:
+                    warm_start(om, previous, self.period)
+                solve_time = time.perf_counter()
+                if persistent:
+                    solver_results = opt.solve(**solve_kwargs)
+                else:
+                    solver_results = om.solve(
+                        solver=solver, solve_kwargs=solve_kwargs, **kwargs)
+                solve_time = time.perf_counter() - solve_time
+                _check_solved(solver_results, 'Window {0} to {1}'.format(
+                    start, stop))
+                results = processing.results(om)
+                steps = min(self.period, last - start)
+                self._commit(results, start - origin, steps, sink)
+                window = {'start': start, 'stop': stop,
+                          'objective': po.value(om.objective),
+                          'solve_time': solve_time}
+                if adaptive is not None:
+                    previous_flows, flows = flows, _flow_values(results)
+                    window['gap'] = _mip_gap(solver_results)
+                    window['change'] = 0.0
+                    if previous_flows is not None:
+                        window['change'] = _decision_change(
+                            flows, previous_flows, self.period)
+                    length = adaptive(length, solve_time, window['gap'],
+                                      window['change'])
+                    window['next_interval_length'] = length
+                self.windows.append(window)
+                logging.info('Window {0} to {1} solved: {2}'.format(
+                    start, stop, window))
+                previous = om
+                if checkpoint is not None:
+                    checkpoint(start + self.period, length)
+        finally:
+            self._reset()
+
+    def _write_checkpoint(self, checkpoint_dir, sink, start, length):
+        """Store the state of the run before the window at `start`
+
+        `length` is the interval length of this window, that may differ from
+        `interval_length` with an adaptive interval.
+        """
+        state = {'horizon': len(self.timeindex),
+                 'interval_length': self.interval_length,
+                 'period': self.period,
+                 'start': start,
+                 'next_interval_length': length,
+                 'storage_levels': {s.label: level for s, level
+                                    in self.storage_levels.items()},
+                 'nonconvex_status': {_labels(key): value for key, value
+                                      in self.nonconvex_status.items()},
+                 'windows': self.windows,
+                 'results': sink.state()}
+        filename = os.path.join(checkpoint_dir, 'checkpoint.pickle')
+        with open(filename + '.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(filename + '.tmp', filename)
+
+    def _read_checkpoint(self, checkpoint_dir, sink):
+        """Restore the state of a previous run
+
+        Returns the start and the interval length of the next window.
+        """
+        filename = os.path.join(checkpoint_dir, 'checkpoint.pickle')
+        if not os.path.isfile(filename):
+            return 0, self.interval_length
+        with open(filename, 'rb') as f:
+            state = pickle.load(f)
+        run = (len(self.timeindex), self.interval_length, self.period)
+        if run != (state['horizon'], state['interval_length'],
+                   state['period']):
+            raise ValueError('The checkpoint in {0} belongs to a run with a '
+                             'different horizon, interval_length or period.'
+                             .format(checkpoint_dir))
+        nodes = {n.label: n for n in self.es.nodes}
+        sink.restore(state['results'], nodes)
+        self.storage_levels = {nodes[label]: level for label, level
+                               in state['storage_levels'].items()}
+        self.nonconvex_status = {(nodes[o], nodes[i]): value for (o, i), value
+                                 in state['nonconvex_status'].items()}
+        self.windows = state['windows']
+        logging.info('Resume from the checkpoint in {0} at time step {1}.'
+                     .format(checkpoint_dir, state['start']))
+        return state['start'], state['next_interval_length']
+
+    def solve(self, solver='cbc', solve_kwargs=None, warmstart=False,
+              rebuild=None, persistent=False, spill_dir=None,
+              checkpoint_dir=None, adaptive=None, **kwargs):
+        """Solve all windows one after another
+
+        Parameters
+        ----------
+        solver : str
+            Name of the solver.
+        solve_kwargs : dict
+            Passed to the solve method of pyomo.
+        warmstart : bool
+            Pass the shifted solution of the previous window to the solver
+            as MIP start (cbc, cplex and gurobi).
+        rebuild : bool
+            Build a new model for every window. By default the model is only
+            rebuilt if not all time series can be updated in the model.
+        persistent : bool
+            Keep the model in a persistent solver instance and only send the
+            changes of each window (cplex and gurobi).
+        spill_dir : str
+            Keep the results as memory-mapped files in this directory (see
+            `ResultsSink`).
+        checkpoint_dir : str
+            Write a checkpoint to this directory after each committed period
+            and resume from an existing checkpoint. The results are kept as
+            memory-mapped files in this directory (`spill_dir` is ignored).
+        adaptive : AdaptiveInterval
+            Adapt the interval length to the solve time, the MIP gap and the
+            change of the committed flows. The chosen lengths are logged and
+            stored in `windows`.
+
+        Other keyword arguments are passed to `solph.Model.solve` (not
+        supported with `persistent`).
+        """
+        solve_kwargs, warmstart, persistent, rebuild = self._options(
+            solver, solve_kwargs, warmstart, persistent, rebuild)
+        first = 0
+        length = None
+        checkpoint = None
+        if checkpoint_dir is not None:
+            spill_dir = os.path.join(checkpoint_dir, 'results')
+        sink = ResultsSink(self.timeindex, spill_dir)
+        if checkpoint_dir is not None:
+            first, length = self._read_checkpoint(checkpoint_dir, sink)
+
+            def checkpoint(start, length):
+                self._write_checkpoint(checkpoint_dir, sink, start, length)
+        self._solve_range(first, len(self.timeindex), sink, solver,
+                          solve_kwargs, warmstart, rebuild, persistent,
+                          origin=0, checkpoint=checkpoint,
+                          adaptive=adaptive, length=length, **kwargs)
+        self.multiperiod_results = sink.results()
+        return self.multiperiod_results
+
+    def solve_parallel(self, blocks, overlap=None, boundary_levels=None,
+                       end_costs=None, max_workers=None, solver='cbc',
+                       solve_kwargs=None, warmstart=False, rebuild=None,
+                       **kwargs):
+        """Solve blocks of the horizon in parallel worker processes
+
+        The horizon is split into `blocks` blocks of equal length. Each block
+        is solved as a rolling horizon of its own, starting with the
+        `boundary_levels` of the storages and the `initial_status` of the
+        nonconvex flows. Afterwards the borders of the blocks are reconciled:
+        the time steps `overlap` before and after each border are solved
+        again, starting with the storage levels and the status of the
+        preceding block. The status at the end is fixed to the status of the
+        following block, the deviation from its storage levels is penalised
+        with `end_costs`.
+
+        Parameters
+        ----------
+        blocks : int
+            Number of blocks.
+        overlap : int
+            Number of time steps on each side of a border that are solved
+            again (default: `period`). At most half the block length and the
+            length of the last block.
+        boundary_levels : dict
+            Estimated storage level of each storage at the start of the
+            blocks (default: the initial storage level, a free level if the
+            initial storage level is None).
+        end_costs : float
+            Costs per unit of deviation of the storage levels at the end of
+            a reconciliation window from the following block (default: ten
+            times the highest variable costs of the flows).
+        max_workers : int
+            Number of worker processes (default: number of processors).
+
+        The other arguments are the same as for `solve`. All labels have to
+        be unique, the results of the workers are passed back by label.
+        """
+        horizon = len(self.timeindex)
+        size = -(-horizon // blocks)
+        borders = list(range(size, horizon, size))
+        # the reconciliation windows of two borders must not overlap and the
+        # last one has to end within the horizon
+        longest = min(size // 2, horizon - borders[-1] if borders else size)
+        if overlap is None:
+            overlap = min(self.period, longest)
+        if not 0 < overlap <= longest:
+            raise ValueError('The overlap must be between 1 and {0} (half the '
+                             'block length and the length of the last '
+                             'block).'.format(longest))
+        solve_kwargs, warmstart, _, rebuild = self._options(
+            solver, solve_kwargs, warmstart, False, rebuild)
+        nodes = {n.label: n for n in self.es.nodes}
+        if len(nodes) != len(self.es.nodes):
+            raise ValueError('The labels of the nodes have to be unique.')
+
+        boundary_levels = {s.label: level
+                           for s, level in (boundary_levels or {}).items()}
+        initial_levels = {
+            s.label: self._initial_storage_levels[s] *
+            s.nominal_storage_capacity for s in self.storages
+            if self._initial_storage_levels[s] is not None}
+        options = (solver, solve_kwargs, warmstart, rebuild, kwargs)
+        if end_costs is None:
+            end_costs = self._default_end_costs()
+        ranges = list(zip([0] + borders, borders + [horizon]))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            jobs = [pool.submit(_solve_block, self._system(),
+                                self.interval_length, self.period, first, last,
+                                {**initial_levels, **boundary_levels}
+                                if first else initial_levels, None, options)
+                    for first, last in ranges]
+            sink = ResultsSink(self.timeindex)
+            self.windows = []
+            for (first, last), job in zip(ranges, jobs):
+                part, windows = job.result()
+                sink.write(part, first, last - first)
+                self.windows.extend(windows)
+            results = sink.results()
+
+            # reconciliation of the block borders
+            storages = [s.label for s in self.storages]
+            nonconvex = [_labels(key) for key in self._nonconvex]
+            jobs = []
+            for border in borders:
+                first, last = border - overlap, border + overlap
+                levels = {
+                    label: results[(label, None)]['sequences'][
+                        'capacity'].iloc[first - 1]
+                    for label in storages}
+                end_levels = {
+                    label: results[(label, None)]['sequences'][
+                        'capacity'].iloc[last - 1]
+                    for label in storages}
+                status = {key: results[key]['sequences']['status'].values
+                          for key in nonconvex}
+                jobs.append(pool.submit(
+                    _solve_block, self._system(), last - first, last - first,
+                    first, last, levels, end_levels, options,
+                    end_costs=end_costs,
+                    initial_status={key: _status(values, first)
+                                    for key, values in status.items()},
+                    end_status={key: int(round(values[last - 1]))
+                                for key, values in status.items()}))
+            for border, job in zip(borders, jobs):
+                part, windows = job.result()
+                sink.write(part, border - overlap, 2 * overlap)
+                self.windows.extend(dict(w, reconciliation=True)
+                                    for w in windows)
+
+        return self._finish(sink, nodes)
+
+    def _system(self):
+        """Time index and nodes of the energy system for a worker process
+
+        The groupings of the energy system cannot be pickled, the worker
+        builds a new energy system from the nodes.
+        """
+        return self.timeindex, list(self.es.nodes)
+
+    def _default_end_costs(self):
+        """Ten times the highest variable costs of the flows"""
+        horizon = len(self.timeindex)
+        return 10 * max([1] + [
+            abs(flow.variable_costs[t]) for flow in
+            self.es.flows().values() for t in range(horizon)])
+
+    def _finish(self, sink, nodes):
+        """Store the results of a sink with results by label"""
+        def node(label):
+            return None if label is None else nodes[label]
+
+        results = sink.results()
+        self.multiperiod_results = {
+            (node(o), node(i)): value for (o, i), value in results.items()}
+        self.storage_levels = {
+            s: results[(s.label, None)]['sequences']['capacity'].iloc[-1]
+            for s in self.storages}
+        return self.multiperiod_results
+
+    def _set_coarse(self, factor):
+        """Average the time index and all time series over `factor` steps
+
+        Returns the number of time steps of each coarse time step.
+        """
+        horizon = len(self.timeindex)
+        starts = np.arange(0, horizon, factor)
+        counts = np.diff(np.append(starts, horizon))
+        self.es.timeindex = self.timeindex[starts]
+        for obj, name, values in self._time_series:
+            _assign(obj, name, np.add.reduceat(
+                values[:horizon].astype(np.float64), starts) / counts)
+        return counts
+
+    def solve_multi_resolution(self, factor, block_length, fix_status=False,
+                               end_costs=None, max_workers=None,
+                               solver='cbc', solve_kwargs=None, **kwargs):
+        """Solve a coarse model first and then hourly blocks in parallel
+
+        The coarse model averages the time series over `factor` time steps
+        and uses a time increment of `factor`. Its storage levels and the
+        status of the `NonConvex` flows at the borders of the blocks are used
+        as initial storage levels and initial status of the blocks. The
+        deviation from the coarse level at the end of a block is penalised
+        with `end_costs`, so a block stays feasible if it cannot reach the
+        coarse level. The on/off status of the `NonConvex` flows is fixed to
+        the coarse status if `fix_status` is True. The blocks of
+        `block_length` time steps are independent and solved in parallel
+        worker processes.
+
+        Parameters
+        ----------
+        factor : int
+            Number of time steps of a coarse time step.
+        block_length : int
+            Number of time steps of a block, a multiple of `factor`.
+        fix_status : bool
+            Fix the status of the nonconvex flows to the coarse solution. The
+            blocks may become infeasible, e.g. with minimum loads and without
+            an excess sink.
+        end_costs : float
+            Costs per unit of deviation of the storage levels at the end of
+            a block from the coarse solution (default: ten times the highest
+            variable costs of the flows).
+        max_workers : int
+            Number of worker processes (default: number of processors).
+
+        The other arguments are the same as for `solve`. The results of the
+        coarse model are stored in `coarse_results`. Constraints that count
+        time steps (minimum up and down times, gradients) are not scaled in
+        the coarse model.
+        """
+        horizon = len(self.timeindex)
+        if block_length % factor:
+            raise ValueError('The block_length has to be a multiple of the '
+                             'factor ({0}).'.format(factor))
+        solve_kwargs, _, _, _ = self._options(
+            solver, solve_kwargs, False, False, True)
+        nodes = {n.label: n for n in self.es.nodes}
+        if len(nodes) != len(self.es.nodes):
+            raise ValueError('The labels of the nodes have to be unique.')
+
+        try:
+            counts = self._set_coarse(factor)
+            coarse = solph.Model(self.es, timeincrement=counts)
+            _check_solved(coarse.solve(solver=solver,
+                                       solve_kwargs=solve_kwargs, **kwargs),
+                          'The coarse model')
+            self.coarse_results = processing.results(coarse)
+        finally:
+            self._reset()
+        logging.info('Coarse model with {0} time steps solved.'
+                     .format(len(counts)))
+
+        coarse_levels = {
+            s.label: self.coarse_results[(s, None)]['sequences'][
+                'capacity'].values for s in self.storages}
+        coarse_status = {
+            _labels(key): np.repeat(self.coarse_results[key]['sequences'][
+                'status'].values.round(), counts)
+            for key in self._nonconvex}
+        status = coarse_status if fix_status else {}
+        initial_levels = {
+            s.label: self._initial_storage_levels[s] *
+            s.nominal_storage_capacity for s in self.storages
+            if self._initial_storage_levels[s] is not None}
+        options = (solver, solve_kwargs, False, True, kwargs)
+        if end_costs is None:
+            end_costs = self._default_end_costs()
+
+        def levels(step):
+            return {label: level[-(-step // factor) - 1]
+                    for label, level in coarse_levels.items()}
+
+        def initial_status(step):
+            return {key: _status(values, step)
+                    for key, values in coarse_status.items()} if step else {}
+
+        ranges = [(first, min(first + block_length, horizon))
+                  for first in range(0, horizon, block_length)]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            jobs = [pool.submit(_solve_block, self._system(), last - first,
+                                last - first, first, last,
+                                levels(first) if first else initial_levels,
+                                levels(last), options, status, end_costs,
+                                initial_status(first))
+                    for first, last in ranges]
+            sink = ResultsSink(self.timeindex)
+            self.windows = []
+            for (first, last), job in zip(ranges, jobs):
+                part, windows = job.result()
+                sink.write(part, first, last - first)
+                self.windows.extend(windows)
+        return self._finish(sink, nodes)
+
+
+def _solve_block(system, interval_length, period, first, last, levels,
+                 end_levels, options, status=None, end_costs=None,
+                 initial_status=None, end_status=None):
+    """Solve the time steps `first` to `last` in a worker process
+
+    `system` is the time index and the nodes of the energy system. The
+    storage levels and the status of the nonconvex flows are given by label.
+    The end levels are penalised with `end_costs`. Returns the results by
+    label and the solved windows.
+    """
+    solver, solve_kwargs, warmstart, rebuild, kwargs = options
+    timeindex, nodes = system
+    # the hash of a node is the hash of its label, which is not restored yet
+    # when the edges are unpickled, so the edges are hashed again
+    for n in nodes:
+        n._in_edges = set(list(n._in_edges))
+        n.outputs.data = dict(list(n.outputs.data.items()))
+    energysystem = solph.EnergySystem(timeindex=timeindex)
+    energysystem.add(*nodes)
+    model = RollingDispatch(energysystem, interval_length, period)
+    nodes = {n.label: n for n in energysystem.nodes}
+    model.storage_levels = {nodes[label]: level
+                            for label, level in levels.items()}
+    if end_levels is not None:
+        end_levels = {nodes[label]: level
+                      for label, level in end_levels.items()}
+    if status is not None:
+        status = {(nodes[o], nodes[i]): values
+                  for (o, i), values in status.items()}
+    model.nonconvex_status = {(nodes[o], nodes[i]): value for (o, i), value
+                              in (initial_status or {}).items()}
+    if end_status is not None:
+        end_status = {(nodes[o], nodes[i]): value
+                      for (o, i), value in end_status.items()}
+    sink = ResultsSink(model.timeindex[first:last])
+    model._solve_range(first, last, sink, solver, solve_kwargs, warmstart,
+                       rebuild, False, end_levels, status=status,
+                       end_costs=end_costs, end_status=end_status, **kwargs)
+    results = {_labels(key): value for key, value in sink.results().items()}
+    return results, model.windows
+
+
+def run_rolling_dispatch_example(solver='cbc', total_time_steps=24*7,
+                                 warmstart=True):
+    data = pd.read_csv(os.path.join(os.path.dirname(__file__), 'data.csv'),
+                       sep=";")
+
+    idx = pd.date_range('1/1/2017', periods=total_time_steps, freq='H')
+    es = solph.EnergySystem(timeindex=idx)
+    Node.registry = es
+
+    bel = solph.Bus(label='bel')
+
+    solph.Sink(label='demand_el', inputs={bel: solph.Flow(
+        fixed=True, actual_value=data['demand_el'][:total_time_steps],
+        nominal_value=8)})
+
+    solph.Source(label='power_plant1', outputs={bel: solph.Flow(
+        nominal_value=35, variable_costs=10.25)})
+
+    solph.Source(label='power_plant2', outputs={bel: solph.Flow(
+        nominal_value=10, min=0.6, max=1.0, variable_costs=5,
+        nonconvex=solph.NonConvex(startup_costs=5))})
+
+    solph.components.GenericStorage(
+        label='storage', nominal_storage_capacity=20,
+        inputs={bel: solph.Flow(nominal_value=5)},
+        outputs={bel: solph.Flow(nominal_value=5)},
+        initial_storage_level=0, balanced=False)
+
+    om = RollingDispatch(es, interval_length=48, period=24)
+    om.solve(solver=solver, warmstart=warmstart)
+    return om
+
+
+if __name__ == '__main__':
+    from oemof.tools import logger
+    logger.define_logging()
+    model = run_rolling_dispatch_example()
+    if plt is not None:
+        views.node(model.multiperiod_results, 'bel')['sequences'].plot(
+            drawstyle='steps-post', grid=True)
+        plt.show()
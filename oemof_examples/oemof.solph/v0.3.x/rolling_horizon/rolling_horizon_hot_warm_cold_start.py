@@ -13,59 +13,68 @@ from oemof.network import Node
 from oemof.solph import (EnergySystem, MultiPeriodModel, Flow, Source, Sink,
                          Bus, RollingHorizon)
 from oemof.outputlib import processing, views
-from time import time
+from oemof.tools import logger
+from instrumentation import PhaseRecorder
+
+# time and memory of each phase are logged as JSON lines
+logger.define_logging()
+phases = PhaseRecorder()
+
 # read sequence data
 full_filename = os.path.join(os.path.dirname(__file__),
                              'data.csv')
-data = pd.read_csv(full_filename, sep=";")
+with phases('data load'):
+    data = pd.read_csv(full_filename, sep=";")
 
 # select periods
 total_time_steps = 24*7
 
 # create an energy system
-idx = pd.date_range('1/1/2017', periods=total_time_steps, freq='H')
-start = time()
-es = EnergySystem(timeindex=idx)
-Node.registry = es
+with phases('node creation', total_time_steps=total_time_steps):
+    idx = pd.date_range('1/1/2017', periods=total_time_steps, freq='H')
+    es = EnergySystem(timeindex=idx)
+    Node.registry = es
 
-# power bus and components
-bel = Bus(label='bel')
+    # power bus and components
+    bel = Bus(label='bel')
 
-demand_el = Sink(
-    label='demand_el',
-    inputs={bel: Flow(
-        fixed=True, actual_value=data['demand_el'], nominal_value=8)})
+    demand_el = Sink(
+        label='demand_el',
+        inputs={bel: Flow(
+            fixed=True, actual_value=data['demand_el'], nominal_value=8)})
 
-pp1 = Source(
-    label='power_plant1',
-    outputs={bel: Flow(nominal_value=35, variable_costs=10.25)})
+    pp1 = Source(
+        label='power_plant1',
+        outputs={bel: Flow(nominal_value=35, variable_costs=10.25)})
 
-pp2 = Source(
-    label='power_plant2',
-    outputs={
-        bel: Flow(
-            nominal_value=10, min=0.6, max=1.0, variable_costs=5,
-            rollinghorizon=RollingHorizon(t_start_cold=5,
-                                          t_start_warm=3,
-                                          t_start_hot=1,
-                                          cold_start_costs=5,
-                                          warm_start_costs=4,
-                                          hot_start_costs=1,
-                                          minimum_downtime=1))})
+    pp2 = Source(
+        label='power_plant2',
+        outputs={
+            bel: Flow(
+                nominal_value=10, min=0.6, max=1.0, variable_costs=5,
+                rollinghorizon=RollingHorizon(t_start_cold=5,
+                                              t_start_warm=3,
+                                              t_start_hot=1,
+                                              cold_start_costs=5,
+                                              warm_start_costs=4,
+                                              hot_start_costs=1,
+                                              minimum_downtime=1))})
 
-print(f'Time for es creation: {time()-start}')
-start = time()
-om = MultiPeriodModel(es, interval_length=48, period=24)
-print(f'Time for model creation: {time()-start:.6f}')
+# the construction of each block and the solver steps are recorded as well
+with phases('model creation', interval_length=48, period=24), \
+        phases.pyomo_timing():
+    om = MultiPeriodModel(es, interval_length=48, period=24)
 # create an optimization problem and solve it
-start = time()
-om.solve(solver='cplex', solve_kwargs={'tee': True})
-print(f'Time for solving: {time()-start:.6f}')
+with phases('solve', solver='cplex'), phases.pyomo_timing():
+    om.solve(solver='cplex',
+             solve_kwargs={'tee': True, 'report_timing': True})
+with phases('results processing'):
+    bel_sequences = views.node(om.multiperiod_results, 'bel')['sequences']
 if plt is not None:
-    def plot_results(results):
+    def plot_results(bel_sequences):
         # plot electrical bus
 
-        result_data = views.node(results, 'bel')['sequences']
+        result_data = bel_sequences
         result_data[(('bel', 'demand_el'), 'flow')] *= -1
         columns = [c for c in result_data.columns
                    if not any(s in str(c) for s in ['status', 'costs'])]
@@ -77,5 +86,6 @@ if plt is not None:
         plt.show()
         return result_data
 
-plotted_results = plot_results(om.multiperiod_results)
+with phases('plot results'):
+    plotted_results = plot_results(bel_sequences)
 plt.plot(plotted_results.iloc[:, 2])
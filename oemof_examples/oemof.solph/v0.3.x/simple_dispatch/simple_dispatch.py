@@ -32,6 +32,7 @@ __copyright__ = "oemof developer group"
 __license__ = "GPLv3"
 
 import os
+import numpy as np
 import pandas as pd
 from oemof.solph import (Sink, Source, Transformer, Bus, Flow, Model,
                          EnergySystem)
@@ -42,6 +43,53 @@ import matplotlib.pyplot as plt
 
 solver = 'cbc'
 
+
+def flow_results(model):
+    """Extract the values of all flows of a solved model in one pass
+
+    All flow values are written into one preallocated array (flows x time
+    steps). The 'sequences' DataFrame of each flow is a view on its row of
+    this array, so no data is copied per flow. The returned dictionary has
+    the structure of `outputlib.processing.results` and can be used with
+    `outputlib.views`. It is stored on the model, so calling the function
+    again is free as long as the model has not been solved again.
+
+    This example only uses flow variables, for components with additional
+    variables (storages, nonconvex flows...) use
+    `outputlib.processing.results`.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        A solved model.
+
+    Returns
+    -------
+    dict
+    """
+    solver_results = getattr(model, 'solver_results', None)
+    memo = getattr(model, '_flow_results_memo', None)
+    if memo is not None and memo[0] is solver_results:
+        return memo[1]
+
+    row = {flow: r for r, flow in enumerate(model.flows)}
+    values = np.full((len(row), len(model.TIMESTEPS)), np.nan)
+    for (i, o, t), var in model.flow.items():
+        if var.value is not None:
+            values[row[i, o], t] = var.value
+
+    results = {}
+    for flow, r in row.items():
+        results[flow] = {
+            'scalars': pd.Series(dtype=float),
+            'sequences': pd.DataFrame(values[r][:, np.newaxis],
+                                      index=model.es.timeindex,
+                                      columns=['flow'], copy=False)}
+
+    model._flow_results_memo = (solver_results, results)
+    return results
+
+
 # Create an energy system and optimize the dispatch at least costs.
 # ####################### initialize and provide data #####################
 
@@ -141,8 +189,8 @@ optimization_model = Model(energysystem=energysystem)
 optimization_model.solve(solver=solver,
                          solve_kwargs={'tee': True, 'keepfiles': False})
 
-# write back results from optimization object to energysystem
-optimization_model.results()
+# extract the results from the optimization model (only once)
+results = flow_results(optimization_model)
 
 # ################################ results ################################
 
@@ -151,12 +199,12 @@ optimization_model.results()
 # investment values within a pandas.Series object.
 # in this case the entry data['scalars'] does not exist since no investment
 # variables are used
-data = views.node(optimization_model.results(), 'bel')
+data = views.node(results, 'bel')
 data['sequences'].info()
 print('Optimization successful. Showing some results:')
 
 # see: https://pandas.pydata.org/pandas-docs/stable/visualization.html
-node_results_bel = views.node(optimization_model.results(), 'bel')
+node_results_bel = views.node(results, 'bel')
 node_results_flows = node_results_bel['sequences']
 
 fig, ax = plt.subplots(figsize=(10, 5))
@@ -177,7 +225,7 @@ ax.set_xticklabels(
 
 plt.show()
 
-node_results_bth = views.node(optimization_model.results(), 'bth')
+node_results_bth = views.node(results, 'bth')
 node_results_flows = node_results_bth['sequences']
 
 fig, ax = plt.subplots(figsize=(10, 5))
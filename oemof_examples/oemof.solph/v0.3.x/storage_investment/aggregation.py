@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+This example solves the storage investment example (variation 1) with a
+small number of typical days instead of the full year.
+
+The time series (demand, wind, pv) are cut into periods (e.g. days or weeks)
+and the periods are clustered with k-means. The period closest to the centre
+of each cluster is used as typical period, the number of periods in the
+cluster is its weight. The variable costs of each time step are multiplied
+with the weight of its typical period, so the objective represents the whole
+year.
+
+The storage level of the typical periods is linked over the original
+periods (inter-period storage linking): the level at the start of each
+original period is the level at the start of the previous period plus the
+change of the level during its typical period. The storage level has to stay
+within the invested capacity in every original period. This way the storage
+can shift energy between seasons although only typical days are modelled.
+
+The results of the typical periods are mapped back onto the full year
+(`expand_sequences`, `storage_level`).
+
+Data
+----
+storage_investment.csv
+
+Installation requirements
+-------------------------
+This example requires the version v0.3.x of oemof. Install by:
+
+    pip install 'oemof>=0.3,<0.4'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+from collections import namedtuple
+from oemof.tools import logger
+from oemof.tools import economics
+import oemof.solph as solph
+from oemof.outputlib import processing
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+
+TypicalPeriods = namedtuple(
+    'TypicalPeriods', ['data', 'weights', 'order', 'period_length'])
+TypicalPeriods.__doc__ = """Result of `cluster_periods`
+
+data : pandas.DataFrame
+    Time series of the typical periods, one after another.
+weights : numpy.ndarray
+    Number of original periods represented by each typical period.
+order : numpy.ndarray
+    Typical period of each original period.
+period_length : int
+    Number of time steps of a period.
+"""
+
+
+def cluster_periods(data, number, period_length=24, iterations=100, seed=0):
+    """Cluster the periods of the time series into typical periods
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Time series, the length has to be a multiple of `period_length`.
+    number : int
+        Number of typical periods.
+    period_length : int
+        Number of time steps of a period (24 for days, 168 for weeks).
+    iterations : int
+        Maximal number of iterations of the k-means algorithm.
+    seed : int
+        Seed of the initial cluster centres.
+
+    Returns
+    -------
+    TypicalPeriods
+    """
+    periods, rest = divmod(len(data), period_length)
+    if rest:
+        raise ValueError('The length of the time series ({0}) is not a '
+                         'multiple of the period length ({1}).'
+                         .format(len(data), period_length))
+    if not 0 < number <= periods:
+        raise ValueError('The number of typical periods has to be between 1 '
+                         'and {0}.'.format(periods))
+    values = data.values.astype(np.float64)
+    scale = np.abs(values).max(axis=0)
+    scale[scale == 0] = 1
+    profiles = (values / scale).reshape(periods, -1)
+
+    # k-means++ initialisation
+    random = np.random.RandomState(seed)
+    centres = [profiles[random.randint(periods)]]
+    for _ in range(1, number):
+        distance = ((profiles[:, None] - np.array(centres)) ** 2).sum(
+            axis=2).min(axis=1)
+        centres.append(profiles[random.choice(
+            periods, p=distance / distance.sum())])
+    centres = np.array(centres)
+
+    order = None
+    for _ in range(iterations):
+        distance = ((profiles[:, None] - centres) ** 2).sum(axis=2)
+        new_order = distance.argmin(axis=1)
+        if order is not None and (new_order == order).all():
+            break
+        order = new_order
+        for c in range(number):
+            members = profiles[order == c]
+            if len(members):
+                centres[c] = members.mean(axis=0)
+            else:
+                # empty cluster: take the period farthest from its centre
+                far = distance[np.arange(periods), order].argmax()
+                centres[c] = profiles[far]
+                order[far] = c
+
+    # use the period closest to the centre (medoid) as typical period
+    distance = ((profiles[:, None] - centres) ** 2).sum(axis=2)
+    medoids = [np.flatnonzero(order == c)[
+        distance[order == c, c].argmin()] for c in range(number)]
+    rows = np.concatenate([np.arange(m * period_length,
+                                     (m + 1) * period_length)
+                           for m in medoids])
+    typical = data.iloc[rows].reset_index(drop=True)
+    weights = np.bincount(order, minlength=number)
+    return TypicalPeriods(typical, weights, order, period_length)
+
+
+def time_step_weights(typical):
+    """Weight of each time step of the typical periods"""
+    return np.repeat(typical.weights, typical.period_length).astype(float)
+
+
+def add_storage_linking(om, storage, typical, initial_storage_level=None,
+                        balanced=True):
+    """Link the storage level of the typical periods over the year
+
+    The storage has to be an investment storage without losses, that is
+    created with `initial_storage_level=None` and `balanced=False`. The
+    initial level and the balance over the year are set by the arguments of
+    this function instead.
+
+    Parameters
+    ----------
+    om : solph.Model
+        Model of the typical periods.
+    storage : solph.components.GenericStorage
+    typical : TypicalPeriods
+    initial_storage_level : float
+        Storage level at the start of the year relative to the capacity.
+    balanced : bool
+        Storage level at the end of the year equals the level at the start.
+    """
+    block = om.GenericInvestmentStorageBlock
+    length = typical.period_length
+    number = len(typical.weights)
+    if any(storage.loss_rate[t] for t in om.TIMESTEPS):
+        raise ValueError('The storage linking does not support a loss rate.')
+    source = list(storage.inputs)[0]
+    target = list(storage.outputs)[0]
+    capacity = block.invest[storage] + storage.investment.existing
+
+    link = po.Block()
+    om.add_component('StorageLinking_' + str(storage.label), link)
+    link.PERIODS = po.Set(initialize=range(number), ordered=True)
+    link.ORIGINAL = po.Set(initialize=range(len(typical.order) + 1),
+                           ordered=True)
+    # shifted level before the first time step of each typical period
+    link.start = po.Var(link.PERIODS, within=po.NonNegativeReals)
+    # lowest and highest level in a typical period relative to its start
+    link.lowest = po.Var(link.PERIODS, within=po.NonPositiveReals)
+    link.highest = po.Var(link.PERIODS, within=po.NonNegativeReals)
+    # level at the start of each original period
+    link.level = po.Var(link.ORIGINAL, within=po.NonNegativeReals)
+
+    def first_balance_rule(link, c):
+        t = c * length
+        return block.capacity[storage, t] == link.start[c] + (
+            om.flow[source, storage, t] * storage.inflow_conversion_factor[t] -
+            om.flow[storage, target, t] / storage.outflow_conversion_factor[t]
+        ) * om.timeincrement[t]
+
+    # the first time step is balanced against init_cap in solph, all other
+    # time steps against the previous time step
+    block.balance_first[storage].deactivate()
+    for c in link.PERIODS:
+        if c > 0:
+            block.balance[storage, c * length].deactivate()
+    link.first_balance = po.Constraint(link.PERIODS, rule=first_balance_rule)
+
+    def relative(c, t):
+        return block.capacity[storage, c * length + t] - link.start[c]
+
+    link.lowest_cstr = po.Constraint(
+        link.PERIODS, list(range(length)),
+        rule=lambda link, c, t: link.lowest[c] <= relative(c, t))
+    link.highest_cstr = po.Constraint(
+        link.PERIODS, list(range(length)),
+        rule=lambda link, c, t: link.highest[c] >= relative(c, t))
+
+    def level_rule(link, d):
+        if d == 0:
+            return po.Constraint.Skip
+        c = typical.order[d - 1]
+        return link.level[d] == link.level[d - 1] + relative(c, length - 1)
+
+    link.level_cstr = po.Constraint(link.ORIGINAL, rule=level_rule)
+    link.level_min = po.Constraint(
+        link.ORIGINAL, rule=lambda link, d: po.Constraint.Skip if
+        d == len(typical.order) else
+        link.level[d] + link.lowest[typical.order[d]] >= 0)
+    link.level_max = po.Constraint(
+        link.ORIGINAL, rule=lambda link, d: po.Constraint.Skip if
+        d == len(typical.order) else
+        link.level[d] + link.highest[typical.order[d]] <= capacity)
+
+    last = len(typical.order)
+    if initial_storage_level is not None:
+        link.initial = po.Constraint(
+            expr=link.level[0] == initial_storage_level * capacity)
+    if balanced:
+        link.balanced = po.Constraint(expr=link.level[last] == link.level[0])
+    return link
+
+
+def expand_sequences(sequences, typical, timeindex):
+    """Map sequences of the typical periods onto the original time steps"""
+    length = typical.period_length
+    rows = (typical.order[:, None] * length + np.arange(length)).ravel()
+    expanded = sequences.iloc[rows]
+    expanded.index = timeindex
+    return expanded
+
+
+def storage_level(om, storage, typical, timeindex):
+    """Storage level of the original time steps"""
+    link = om.find_component('StorageLinking_' + str(storage.label))
+    block = om.GenericInvestmentStorageBlock
+    length = typical.period_length
+    level = np.empty(len(typical.order) * length)
+    for d, c in enumerate(typical.order):
+        start = po.value(link.level[d]) - po.value(link.start[c])
+        level[d * length:(d + 1) * length] = [
+            start + po.value(block.capacity[storage, c * length + t])
+            for t in range(length)]
+    return pd.Series(level, index=timeindex, name='capacity')
+
+
+def expand_results(om, typical, timeindex):
+    """Results in the format of `processing.results` for the whole year
+
+    The storage level of investment storages with a storage linking is the
+    level over the original periods.
+    """
+    # the linking variables are not indexed by nodes, so they are hidden from
+    # `processing.results`
+    links = [om.find_component('StorageLinking_' + str(n.label))
+             for n in om.es.nodes]
+    links = [link for link in links if link is not None]
+    for link in links:
+        om.del_component(link)
+    try:
+        results = processing.results(om)
+    finally:
+        for link in links:
+            om.add_component(link.local_name, link)
+    expanded = {}
+    for (node, other), value in results.items():
+        sequences = expand_sequences(value['sequences'], typical, timeindex)
+        link = om.find_component('StorageLinking_' + str(node.label))
+        if other is None and link is not None:
+            sequences = sequences.copy()
+            sequences['capacity'] = storage_level(om, node, typical,
+                                                  timeindex).values
+        expanded[(node, other)] = {'scalars': value['scalars'],
+                                   'sequences': sequences}
+    return expanded
+
+
+def run_typical_periods(data, number=12, period_length=24, solver='cbc'):
+    """Variation 1 of the storage investment example with typical periods
+
+    Returns the model, the storage, the typical periods and the results of
+    the whole year.
+    """
+    typical = cluster_periods(data[['demand_el', 'pv', 'wind']], number,
+                              period_length)
+    weights = time_step_weights(typical)
+    timeindex = pd.date_range('1/1/2012', periods=len(weights), freq='H')
+    energysystem = solph.EnergySystem(timeindex=timeindex)
+
+    epc_wind = economics.annuity(capex=1000, n=20, wacc=0.05)
+    epc_pv = economics.annuity(capex=1000, n=20, wacc=0.05)
+    epc_storage = economics.annuity(capex=1000, n=20, wacc=0.05)
+
+    bgas = solph.Bus(label="natural_gas")
+    bel = solph.Bus(label="electricity")
+    excess = solph.Sink(label='excess_bel', inputs={bel: solph.Flow()})
+
+    # the weights make the variable costs represent the whole year
+    gas_resource = solph.Source(label='rgas', outputs={bgas: solph.Flow(
+        variable_costs=0.04 * weights)})
+    wind = solph.Source(label='wind', outputs={bel: solph.Flow(
+        actual_value=typical.data['wind'], fixed=True,
+        investment=solph.Investment(ep_costs=epc_wind))})
+    pv = solph.Source(label='pv', outputs={bel: solph.Flow(
+        actual_value=typical.data['pv'], fixed=True,
+        investment=solph.Investment(ep_costs=epc_pv))})
+    demand = solph.Sink(label='demand', inputs={bel: solph.Flow(
+        actual_value=typical.data['demand_el'], fixed=True,
+        nominal_value=1)})
+    pp_gas = solph.Transformer(
+        label="pp_gas",
+        inputs={bgas: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=10e10, variable_costs=0)},
+        conversion_factors={bel: 0.58})
+    storage = solph.components.GenericStorage(
+        label='storage',
+        inputs={bel: solph.Flow(variable_costs=0.0001 * weights)},
+        outputs={bel: solph.Flow()},
+        loss_rate=0.00, initial_storage_level=None, balanced=False,
+        invest_relation_input_capacity=1/6,
+        invest_relation_output_capacity=1/6,
+        inflow_conversion_factor=1, outflow_conversion_factor=0.8,
+        investment=solph.Investment(ep_costs=epc_storage),
+    )
+    energysystem.add(bgas, bel, excess, gas_resource, wind, pv, demand,
+                     pp_gas, storage)
+
+    om = solph.Model(energysystem)
+    add_storage_linking(om, storage, typical, initial_storage_level=0)
+    om.solve(solver=solver)
+
+    year = pd.date_range('1/1/2012', periods=len(data), freq='H')
+    return om, storage, typical, expand_results(om, typical, year)
+
+
+if __name__ == '__main__':
+    logger.define_logging()
+
+    full_filename = os.path.join(os.path.dirname(__file__),
+                                 'storage_investment.csv')
+    data = pd.read_csv(full_filename, sep=",")[:8760]
+
+    logging.info('Cluster the year into typical days and optimise')
+    om, storage, typical, results = run_typical_periods(data)
+
+    pp_gas = [n for n in om.es.nodes if n.label == 'pp_gas'][0]
+    demand = [n for n in om.es.nodes if n.label == 'demand'][0]
+    bel = [n for n in om.es.nodes if n.label == 'electricity'][0]
+    print('Weights of the typical days: {0}'.format(typical.weights))
+    print('storage_invest_GWh: {0}'.format(
+        results[(storage, None)]['scalars']['invest'] / 1e6))
+    for label in ['wind', 'pv']:
+        source = [n for n in om.es.nodes if n.label == label][0]
+        print('{0}_invest_MW: {1}'.format(
+            label, results[(source, bel)]['scalars']['invest'] / 1e3))
+    print('res_share: {0}'.format(float(
+        1 - results[(pp_gas, bel)]['sequences'].sum() /
+        results[(bel, demand)]['sequences'].sum())))
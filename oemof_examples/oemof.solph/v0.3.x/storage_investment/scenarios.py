@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+This example runs the four variations of the storage investment example
+(v1 to v4 in this folder) as scenarios in parallel worker processes.
+
+All scenarios share the same energy system and differ only in a few
+parameters. A scenario is therefore defined as a set of overrides of the
+BASE parameters:
+
+    - wind_capacity/pv_capacity: installed capacity, None to optimise it
+    - price_gas: variable costs of the gas resource
+    - fossil_share: limit the gas consumption to a share of the demand
+      instead of using a gas price (None to use the price)
+
+The input time series are read once and placed in shared memory. Every
+worker maps this memory instead of reading the csv-file again. The results
+and the meta results of all scenarios are collected in one table.
+
+Data
+----
+storage_investment.csv
+
+Installation requirements
+-------------------------
+This example requires the version v0.3.x of oemof and python >= 3.8. Install
+by:
+
+    pip install 'oemof>=0.3,<0.4'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+from oemof.tools import logger
+from oemof.tools import economics
+import oemof.solph as solph
+from oemof.outputlib import processing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+BASE = {
+    'number_timesteps': 8760,
+    'price_gas': 0.04,
+    'fossil_share': None,
+    'wind_capacity': None,
+    'pv_capacity': None,
+    'capex_wind': 1000,
+    'capex_pv': 1000,
+    'capex_storage': 1000,
+    'solver': 'cbc',
+}
+
+SCENARIOS = [
+    {'name': 'v1_invest_optimize_all_technologies'},
+    {'name': 'v2_invest_optimize_only_gas_and_storage',
+     'wind_capacity': 1000000, 'pv_capacity': 600000},
+    {'name': 'v3_invest_optimize_only_storage_with_fossil_share',
+     'wind_capacity': 1000000, 'pv_capacity': 600000, 'fossil_share': 0.2},
+    {'name': 'v4_invest_optimize_all_technologies_with_fossil_share',
+     'fossil_share': 0.2},
+]
+
+# time series of the worker process (view on the shared memory)
+_data = None
+_shm = None
+
+
+def share_data(data):
+    """Copy the columns of a DataFrame into a new shared memory block
+
+    Returns the shared memory and the arguments for `attach_data`.
+    """
+    values = np.ascontiguousarray(data.values, dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    return shm, (shm.name, values.shape, list(data.columns))
+
+
+def attach_data(name, shape, columns):
+    """Map the shared time series in a worker process (pool initializer)"""
+    global _data, _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+    _data = pd.DataFrame(values, columns=columns, copy=False)
+
+
+def run_scenario(scenario):
+    """Build and solve the energy system of one scenario"""
+    p = dict(BASE, **scenario)
+    data = _data.iloc[:p['number_timesteps']]
+
+    date_time_index = pd.date_range('1/1/2012',
+                                    periods=p['number_timesteps'], freq='H')
+    energysystem = solph.EnergySystem(timeindex=date_time_index)
+
+    bgas = solph.Bus(label="natural_gas")
+    bel = solph.Bus(label="electricity")
+
+    excess = solph.Sink(label='excess_bel', inputs={bel: solph.Flow()})
+
+    if p['fossil_share'] is None:
+        gas_flow = solph.Flow(variable_costs=p['price_gas'])
+    else:
+        gas_flow = solph.Flow(
+            nominal_value=(p['fossil_share'] * data['demand_el'].sum()
+                           / 0.58),
+            summed_max=1)
+    gas_resource = solph.Source(label='rgas', outputs={bgas: gas_flow})
+
+    renewables = {}
+    for label in ['wind', 'pv']:
+        if p[label + '_capacity'] is None:
+            size = {'investment': solph.Investment(
+                ep_costs=economics.annuity(capex=p['capex_' + label], n=20,
+                                           wacc=0.05))}
+        else:
+            size = {'nominal_value': p[label + '_capacity']}
+        renewables[label] = solph.Source(label=label, outputs={
+            bel: solph.Flow(actual_value=data[label], fixed=True, **size)})
+
+    demand = solph.Sink(label='demand', inputs={bel: solph.Flow(
+        actual_value=data['demand_el'], fixed=True, nominal_value=1)})
+
+    pp_gas = solph.Transformer(
+        label="pp_gas",
+        inputs={bgas: solph.Flow()},
+        outputs={bel: solph.Flow(nominal_value=10e10, variable_costs=0)},
+        conversion_factors={bel: 0.58})
+
+    storage = solph.components.GenericStorage(
+        label='storage',
+        inputs={bel: solph.Flow(variable_costs=0.0001)},
+        outputs={bel: solph.Flow()},
+        loss_rate=0.00, initial_storage_level=0,
+        invest_relation_input_capacity=1/6,
+        invest_relation_output_capacity=1/6,
+        inflow_conversion_factor=1, outflow_conversion_factor=0.8,
+        investment=solph.Investment(ep_costs=economics.annuity(
+            capex=p['capex_storage'], n=20, wacc=0.05)),
+    )
+
+    energysystem.add(bgas, bel, excess, gas_resource, demand, pp_gas,
+                     storage, *renewables.values())
+
+    om = solph.Model(energysystem)
+    om.solve(solver=p['solver'])
+
+    results = processing.results(om)
+    meta_results = processing.meta_results(om)
+
+    row = {'scenario': p['name'],
+           'objective': meta_results['objective'],
+           'storage_invest_GWh': (results[(storage, None)]['scalars']
+                                  ['invest'] / 1e6)}
+    for label, source in renewables.items():
+        if p[label + '_capacity'] is None:
+            row[label + '_invest_MW'] = (results[(source, bel)]['scalars']
+                                         ['invest'] / 1e3)
+    row['res_share'] = float(
+        1 - results[(pp_gas, bel)]['sequences'].sum() /
+        results[(bel, demand)]['sequences'].sum())
+
+    # meta results of the problem and the solver
+    for section in ['problem', 'solver']:
+        for key, value in meta_results[section].items():
+            if not isinstance(value, (int, float, str)):
+                value = str(value)
+            row['{0}: {1}'.format(section, key)] = value
+    return row
+
+
+def run_scenarios(scenarios, data, max_workers=None):
+    """Run the scenarios in parallel worker processes
+
+    Parameters
+    ----------
+    scenarios : list of dict
+        Overrides of the BASE parameters, each with a 'name'.
+    data : pandas.DataFrame
+        Time series with the columns demand_el, pv and wind.
+    max_workers : int
+        Number of worker processes (default: number of processors).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per scenario.
+    """
+    shm, attach_args = share_data(data)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=attach_data,
+                                 initargs=attach_args) as pool:
+            rows = list(pool.map(run_scenario, scenarios))
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.DataFrame(rows).set_index('scenario')
+
+
+if __name__ == '__main__':
+    logger.define_logging()
+
+    full_filename = os.path.join(os.path.dirname(__file__),
+                                 'storage_investment.csv')
+    timeseries = pd.read_csv(full_filename, sep=",")[
+        ['demand_el', 'pv', 'wind']]
+
+    logging.info('Run {0} scenarios'.format(len(SCENARIOS)))
+    table = run_scenarios(SCENARIOS, timeseries)
+
+    pd.set_option('display.width', 200)
+    print(table)
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Structural reduction of the nodes of an energy system before the model is
+built (`Reduction`). Flows that can only be zero, nodes that cannot be used
+and buses with only one input and one output are removed. The results of
+the reduced model can be expanded back to the original nodes and flows.
+
+Only the basic nodes (`Source`, `Sink`, `Transformer` and `Bus`) are
+changed, all other components are left as they are.
+
+>>> reduction = Reduction(nodes)
+>>> energysystem.add(*reduction.nodes)
+>>> om = solph.Model(energysystem)
+>>> om.solve()
+>>> results = reduction.expand(outputlib.processing.results(om),
+...                            energysystem.timeindex)
+
+Import this module from other examples (e.g. the scenarios of the
+excel_reader) by adding this folder to the python path.
+
+Installation requirements
+-------------------------
+This example requires the version v0.3.x of oemof. Install by:
+
+    pip install "oemof>=0.3,<0.4"
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+import pandas as pd
+import oemof.solph as solph
+
+# nodes that are changed by the reduction, all other components are kept
+BASIC_NODES = (solph.Source, solph.Sink, solph.Transformer, solph.Bus)
+
+
+def _is_basic(node):
+    return type(node) in BASIC_NODES
+
+
+def _is_constant(value, number):
+    """True if a solph sequence (or list) is `number` everywhere"""
+    if not hasattr(value, '__iter__'):
+        return value == number
+    if getattr(value, 'default', number) != number:
+        return False
+    return all(v == number for v in value)
+
+
+def _zero_flow(flow):
+    """True if the flow can only be zero"""
+    if flow.investment is not None or flow.nominal_value is None:
+        return False
+    return flow.nominal_value == 0 or (
+        flow.fixed and _is_constant(flow.actual_value, 0))
+
+
+def _plain_flow(flow):
+    """True if the flow has no bounds, costs or other constraints"""
+    return (flow.nominal_value is None and flow.investment is None and
+            flow.nonconvex is None and not flow.fixed and
+            flow.summed_max is None and flow.summed_min is None and
+            _is_constant(flow.variable_costs, 0) and
+            _is_constant(flow.positive_gradient['ub'], None) and
+            _is_constant(flow.negative_gradient['ub'], None))
+
+
+class Reduction:
+    """Structural reduction of the nodes before the model is built
+
+    The reduction changes the flows of the nodes in place:
+
+        - transformers with a flow that can only be zero (nominal_value=0 or
+          a fixed flow without any value) are removed with all their flows,
+          as the conversion factors tie all flows of a transformer together
+        - other flows between sources, sinks and buses that can only be
+          zero are removed
+        - transformers without any input and nodes without any flow are
+          removed
+        - sources, transformers and buses without a path to a sink, an
+          unbalanced bus or another component are removed with their flows
+        - balanced buses with one input and one output are replaced by a
+          flow from the input to the output node, if one of the two flows has
+          no bounds or costs
+
+    Flows of other components (e.g. storages) are not changed.
+
+    Parameters
+    ----------
+    nodes : iterable
+        All nodes of the energy system, not added to an energy system yet.
+
+    Attributes
+    ----------
+    nodes : list
+        The remaining nodes.
+    steps : list
+        The steps of the reduction to restore the nodes.
+    flow_map : dict
+        The key (source, target) of each original flow and the key of the
+        flow of the reduced nodes that has its values (None for a removed
+        flow). The input and the output flow of a merged bus are both
+        mapped to the flow that replaces the bus.
+    """
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self.steps = []
+        changed = True
+        while changed:
+            changed = (self._remove_zero_flows() + self._remove_unused() +
+                       self._remove_cut_off() + self._merge_buses()) > 0
+        for step in self.steps:
+            logging.info('Reduction: {0} {1}'.format(
+                step[0], ', '.join(str(n) for n in step[1:3])))
+        self.flow_map = self._flow_map()
+
+    def _remove_flow(self, source, target):
+        self.steps.append(('remove flow', source, target,
+                           source.outputs[target]))
+        del source.outputs[target]
+
+    def _remove_node(self, node):
+        for source in list(node.inputs):
+            self._remove_flow(source, node)
+        for target in list(node.outputs):
+            self._remove_flow(node, target)
+        self.nodes.remove(node)
+        self.steps.append(('remove node', node))
+
+    def _remove_zero_flows(self):
+        flows = [(n, o) for n in self.nodes for o, flow in n.outputs.items()
+                 if _zero_flow(flow) and _is_basic(n) and _is_basic(o)]
+        transformers = []
+        for source, target in flows:
+            ends = [n for n in (source, target)
+                    if type(n) is solph.Transformer]
+            if ends:
+                transformers.extend(n for n in ends if n not in transformers)
+            elif target in source.outputs:
+                self._remove_flow(source, target)
+        for node in transformers:
+            self._remove_node(node)
+        return len(flows)
+
+    def _remove_unused(self):
+        unused = [n for n in self.nodes if _is_basic(n) and (
+                  not (n.inputs or n.outputs) or
+                  (type(n) is solph.Transformer and not n.inputs))]
+        for node in unused:
+            self._remove_node(node)
+        return len(unused)
+
+    def _remove_cut_off(self):
+        # other components are kept, so the nodes they feed into (and the
+        # nodes feeding into these) are kept as well
+        reached = set(n for n in self.nodes if isinstance(n, solph.Sink) or
+                      (isinstance(n, solph.Bus) and not n.balanced))
+        for node in self.nodes:
+            if not _is_basic(node):
+                reached.add(node)
+                reached.update(node.outputs)
+        stack = list(reached)
+        while stack:
+            for source in stack.pop().inputs:
+                if source not in reached:
+                    reached.add(source)
+                    stack.append(source)
+        cut_off = [n for n in self.nodes
+                   if n not in reached and _is_basic(n)]
+        for node in cut_off:
+            self._remove_node(node)
+        return len(cut_off)
+
+    def _merge_buses(self):
+        merged = 0
+        for bus in [n for n in self.nodes if type(n) is solph.Bus]:
+            if not (bus.balanced and len(bus.inputs) == 1 and
+                    len(bus.outputs) == 1):
+                continue
+            source, = bus.inputs
+            target, = bus.outputs
+            inflow = source.outputs[bus]
+            outflow = bus.outputs[target]
+            if (source is target or target in source.outputs or
+                    not _is_basic(source) or not _is_basic(target) or
+                    not (_plain_flow(inflow) or _plain_flow(outflow))):
+                continue
+            flow = outflow if _plain_flow(inflow) else inflow
+            del source.outputs[bus]
+            del bus.outputs[target]
+            source.outputs[target] = flow
+            for node, old, new in [(source, bus, target),
+                                   (target, bus, source)]:
+                factors = getattr(node, 'conversion_factors', {})
+                if old in factors:
+                    factors[new] = factors.pop(old)
+            self.nodes.remove(bus)
+            self.steps.append(('merge bus', bus, source, target, inflow,
+                               outflow))
+            merged += 1
+        return merged
+
+    def _flow_map(self):
+        """Map the original flows to the flows of the reduced nodes"""
+        flow_map = {(n, o): (n, o) for n in self.nodes for o in n.outputs}
+        # undo the steps, starting with the last one
+        for step in reversed(self.steps):
+            if step[0] == 'remove flow':
+                flow_map[step[1], step[2]] = None
+            elif step[0] == 'merge bus':
+                bus, source, target = step[1:4]
+                reduced = flow_map.pop((source, target))
+                flow_map[source, bus] = reduced
+                flow_map[bus, target] = reduced
+        return flow_map
+
+    def expand(self, results, timeindex):
+        """Results of the original nodes and flows
+
+        The results of the flows are taken from the flows they are mapped to
+        in `flow_map` (as a copy). Removed flows are added with a flow of
+        zero. The results of the nodes (key (node, None)) are kept.
+        """
+        expanded = {k: v for k, v in results.items() if k[1] is None}
+        for key, reduced in self.flow_map.items():
+            if reduced is None:
+                expanded[key] = {
+                    'scalars': pd.Series(dtype=float),
+                    'sequences': pd.DataFrame({'flow': 0.0},
+                                              index=timeindex)}
+            else:
+                expanded[key] = {name: value.copy()
+                                 for name, value in results[reduced].items()}
+        return expanded
+
+    def restore(self):
+        """Restore the original flows of the nodes"""
+        for step in reversed(self.steps):
+            if step[0] == 'remove flow':
+                step[1].outputs[step[2]] = step[3]
+            elif step[0] == 'remove node':
+                self.nodes.append(step[1])
+            elif step[0] == 'merge bus':
+                bus, source, target, inflow, outflow = step[1:]
+                del source.outputs[target]
+                source.outputs[bus] = inflow
+                bus.outputs[target] = outflow
+                for node, old, new in [(source, bus, target),
+                                       (target, bus, source)]:
+                    factors = getattr(node, 'conversion_factors', {})
+                    if new in factors:
+                        factors[old] = factors.pop(new)
+                self.nodes.append(bus)
+        self.steps = []
+        self.flow_map = self._flow_map()
@@ -11,6 +11,13 @@ and power demand. The i/o balance plot shows that the fixed chp plant produces
 heat and power excess and therefore needs more natural gas. The bar plot just
 shows the difference in the usage of natural gas.
 
+The dummy transformer `fixed_chp_gas` has an input with a nominal value of
+zero. Before the model is built, a structural reduction (`Reduction` in
+reduction.py) removes such transformers, nodes that cannot be used anymore or
+are cut off from any sink, and merges buses with only one input and one
+output. The results are expanded back to the original nodes and flows
+afterwards, so they can be plotted as usual.
+
 Installation requirements
 -------------------------
 This example requires the version v0.3.x of oemof. Install by:
@@ -46,6 +53,9 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# structural reduction of the nodes (reduction.py in this folder)
+from reduction import Reduction
+
 # import oemof plots
 try:
     from oemof_visio import plot as oeplot
@@ -182,7 +192,10 @@ noded['variable_chp_gas'] = solph.components.ExtractionTurbineCHP(
 
 logging.info('Optimise the energy system')
 
-energysystem.add(*noded.values())
+# remove the dummy transformer and other unused parts before the model is
+# built
+reduction = Reduction(noded.values())
+energysystem.add(*reduction.nodes)
 
 om = solph.Model(energysystem)
 
@@ -193,7 +206,9 @@ om = solph.Model(energysystem)
 logging.info('Solve the optimization problem')
 om.solve(solver='cbc', solve_kwargs={'tee': False})
 
-results = outputlib.processing.results(om)
+# results of all nodes and flows, including the removed ones
+results = reduction.expand(outputlib.processing.results(om),
+                           energysystem.timeindex)
 
 ##########################################################################
 # Plot the results